@@ -0,0 +1,55 @@
+"""Micro-benchmarks of the coordinate transformation kernels.
+
+Run with ``python benchmarks/bench_utils.py``.
+"""
+
+import timeit
+
+import numpy as np
+
+from fourim.backend.utils import compare_angles, transform_coordinates
+
+
+def benchmark(name: str, func, number: int = 50) -> None:
+    """Prints the best time per call of a function."""
+    best = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"{name:<40} {best * 1e3:8.3f} ms")
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    x, y = rng.normal(size=(2, 512, 512))
+    out = np.empty_like(x), np.empty_like(y)
+    angles = rng.uniform(-np.pi, np.pi, (512, 512))
+    stacked_cinc, stacked_pa = np.full((16, 1), 0.5), np.full((16, 1), 30.0)
+    u, v = rng.normal(size=(2, 4096))
+    stacked_out = np.empty((16, 4096)), np.empty((16, 4096))
+
+    print("512 x 512 grid")
+    benchmark(
+        "transform_coordinates (stretch)", lambda: transform_coordinates(x, y, 0.5)
+    )
+    benchmark(
+        "transform_coordinates (rotate + stretch)",
+        lambda: transform_coordinates(x, y, 0.5, 30, axis="x"),
+    )
+    benchmark(
+        "transform_coordinates (out=)",
+        lambda: transform_coordinates(x, y, 0.5, 30, axis="x", out=out),
+    )
+    benchmark("compare_angles", lambda: compare_angles(angles, 1.0))
+    benchmark("compare_angles (out=)", lambda: compare_angles(angles, 1.0, out=x))
+
+    print("16 stacked components x 4096 uv-points")
+    benchmark(
+        "transform_coordinates",
+        lambda: transform_coordinates(u, v, stacked_cinc, stacked_pa),
+    )
+    benchmark(
+        "transform_coordinates (out=)",
+        lambda: transform_coordinates(u, v, stacked_cinc, stacked_pa, out=stacked_out),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,15 @@
 import copy
 import inspect
 from types import SimpleNamespace
+from typing import Dict, Iterable, List, Tuple
 
 import astropy.units as u
 import numpy as np
 from numpy.typing import NDArray
-from scipy.special import j0, j1
+from scipy.special import j0, j1, jv
 
 from ..config.options import OPTIONS
+from .snapshot import ComponentSnapshot, FrozenNamespace
 from .utils import compare_angles, transform_coordinates, get_param_value
 
 
@@ -28,16 +30,92 @@ def make_component(name: str) -> SimpleNamespace:
         name=name,
         vis=functions[f"{name}_vis"],
         img=functions[f"{name}_img"],
+        jac=functions[f"{name}_vis_jac"],
         params=SimpleNamespace(**params),
     )
     return component
 
 
-def background_vis(spf: NDArray, psi: NDArray, params: SimpleNamespace) -> complex:
+def stack_params(
+    components: Iterable[ComponentSnapshot],
+    names: List[str] | None = None,
+    ndim: int = 1,
+) -> FrozenNamespace:
+    """Stacks the parameters of several components into arrays.
+
+    The stacked values have the shape (n_comp, ..., 1, ...) with ndim trailing
+    axes, so they broadcast against the coordinate grids. Parameters that hold
+    several values (e.g., samples) keep these as additional axes.
+    """
+    components = list(components)
+    names = names or list(vars(components[0].params).keys())
+
+    params = {}
+    for name in names:
+        values = [getattr(component.params, name).value for component in components]
+        values = np.array(values, dtype=float)
+        params[name] = getattr(components[0].params, name)._replace(
+            value=values.reshape(values.shape + (1,) * ndim)
+        )
+    return FrozenNamespace(**params)
+
+
+def stack_components(
+    components: Iterable[ComponentSnapshot], ndim: int = 1, chunk: int | None = None
+) -> List[SimpleNamespace]:
+    """Groups the components by their type and stacks their parameters.
+
+    Parameters
+    ----------
+    components : iterable of ComponentSnapshot
+        The model's components.
+    ndim : int, optional
+        The number of dimensions of the coordinate grids.
+    chunk : int, optional
+        The maximum number of components in a group.
+
+    Returns
+    -------
+    groups : list of types.SimpleNamespace
+        The groups of components, each containing the indices of its
+        components in the model.
+    """
+    indices = {}
+    components = list(components)
+    for index, component in enumerate(components):
+        indices.setdefault(component.name, []).append(index)
+
+    groups = []
+    for name, group_indices in indices.items():
+        chunk_size = chunk or len(group_indices)
+        for start in range(0, len(group_indices), chunk_size):
+            chunk_indices = group_indices[start : start + chunk_size]
+            members = [components[index] for index in chunk_indices]
+            groups.append(
+                SimpleNamespace(
+                    name=name,
+                    vis=members[0].vis,
+                    img=members[0].img,
+                    jac=members[0].jac,
+                    params=stack_params(members, ndim=ndim),
+                    indices=np.array(chunk_indices),
+                )
+            )
+    return groups
+
+
+def background_vis(spf: NDArray, psi: NDArray, params: SimpleNamespace) -> NDArray:
     """A background's complex visibility."""
-    complex_vis = np.zeros_like(spf)
-    complex_vis[np.where(spf == 0)[0]] = 1
-    return complex_vis.astype(complex)
+    complex_vis = np.zeros_like(spf, dtype=complex)
+    complex_vis[spf == 0] = 1
+    return complex_vis
+
+
+def background_vis_jac(
+    spf: NDArray, psi: NDArray, params: SimpleNamespace
+) -> Tuple[NDArray, Dict[str, NDArray]]:
+    """A background's visibility derivatives."""
+    return np.zeros_like(spf, dtype=complex), {}
 
 
 def background_img(rho: NDArray, phi: NDArray, params: SimpleNamespace) -> NDArray:
@@ -45,19 +123,27 @@ def background_img(rho: NDArray, phi: NDArray, params: SimpleNamespace) -> NDArr
     return np.ones_like(rho)
 
 
-def point_vis(spf: NDArray, psi: NDArray, params: SimpleNamespace) -> complex:
+def point_vis(spf: NDArray, psi: NDArray, params: SimpleNamespace) -> NDArray:
     """A point source's complex visibility."""
-    return complex(1, 0)
+    return np.ones_like(spf, dtype=complex)
+
+
+def point_vis_jac(
+    spf: NDArray, psi: NDArray, params: SimpleNamespace
+) -> Tuple[NDArray, Dict[str, NDArray]]:
+    """A point source's visibility derivatives."""
+    return np.zeros_like(spf, dtype=complex), {}
 
 
 def point_img(rho: NDArray, phi: NDArray, params: SimpleNamespace) -> NDArray:
     """A point source's image."""
     x0, y0 = get_param_value(params.x).value, get_param_value(params.y).value
-    img = np.zeros_like(rho)
     x0t, y0t = transform_coordinates(x0, y0)
     rho0, theta0 = np.hypot(x0t, y0t), np.arctan2(x0t, y0t)
-    idx = np.argmin(np.hypot(rho - rho0, compare_angles(phi, theta0)))
-    img.flat[idx] = 1
+    img = np.zeros(np.broadcast(rho, rho0).shape)
+    distance = np.hypot(rho - rho0, compare_angles(phi, theta0))
+    idx = np.argmin(distance.reshape(img.shape[:-2] + (-1,)), axis=-1)
+    np.put_along_axis(img.reshape(img.shape[:-2] + (-1,)), idx[..., None], 1, axis=-1)
     return img
 
 
@@ -69,6 +155,16 @@ def gauss_vis(spf: NDArray, psi: NDArray, params: SimpleNamespace) -> NDArray:
     ).astype(complex)
 
 
+def gauss_vis_jac(
+    spf: NDArray, psi: NDArray, params: SimpleNamespace
+) -> Tuple[NDArray, Dict[str, NDArray]]:
+    """A Gaussian's visibility derivatives with respect to the spatial
+    frequency and the fwhm (in its unit)."""
+    fwhm = get_param_value(params.fwhm).to(u.rad).value
+    dvis = -2 * np.pi**2 / (4 * np.log(2)) * fwhm * spf * gauss_vis(spf, psi, params)
+    return dvis * fwhm, {"fwhm": dvis * spf * u.Unit(params.fwhm.unit).to(u.rad)}
+
+
 def gauss_img(rho: NDArray, phi: NDArray, params: SimpleNamespace) -> NDArray:
     """A Gaussian's image."""
     fwhm = get_param_value(params.fwhm).value
@@ -85,6 +181,16 @@ def lorentz_vis(spf: NDArray, psi: NDArray, params: SimpleNamespace) -> NDArray:
     return np.exp(-2 * np.pi * hlr.to(u.rad).value * spf / np.sqrt(3)).astype(complex)
 
 
+def lorentz_vis_jac(
+    spf: NDArray, psi: NDArray, params: SimpleNamespace
+) -> Tuple[NDArray, Dict[str, NDArray]]:
+    """A Lorentzian's visibility derivatives with respect to the spatial
+    frequency and the hlr (in its unit)."""
+    hlr = get_param_value(params.hlr).to(u.rad).value
+    dvis = -2 * np.pi / np.sqrt(3) * lorentz_vis(spf, psi, params)
+    return dvis * hlr, {"hlr": dvis * spf * u.Unit(params.hlr.unit).to(u.rad)}
+
+
 def lorentz_img(rho: NDArray, phi: NDArray, params: SimpleNamespace) -> NDArray:
     """A Gaussian's image."""
     hlr = get_param_value(params.hlr).value
@@ -98,6 +204,18 @@ def uniform_disc_vis(spf: NDArray, psi: NDArray, params: SimpleNamespace) -> NDA
     return np.nan_to_num(complex_vis.astype(complex), nan=1)
 
 
+def uniform_disc_vis_jac(
+    spf: NDArray, psi: NDArray, params: SimpleNamespace
+) -> Tuple[NDArray, Dict[str, NDArray]]:
+    """An uniform disc's visibility derivatives with respect to the spatial
+    frequency and the diameter (in its unit)."""
+    diam = get_param_value(params.diam).to(u.rad).value
+    arg = np.pi * diam * spf
+    dvis = -2 * np.divide(jv(2, arg), arg, out=np.zeros_like(arg), where=arg != 0)
+    dvis = np.pi * dvis.astype(complex)
+    return dvis * diam, {"diam": dvis * spf * u.Unit(params.diam.unit).to(u.rad)}
+
+
 def uniform_disc_img(rho: NDArray, phi: NDArray, params: SimpleNamespace) -> NDArray:
     """A uniform disc's image."""
     diam = get_param_value(params.diam).value
@@ -110,6 +228,16 @@ def Iring_vis(spf: NDArray, psi: NDArray, params: SimpleNamespace) -> NDArray:
     return j0(2 * np.pi * rin * spf).astype(complex)
 
 
+def Iring_vis_jac(
+    spf: NDArray, psi: NDArray, params: SimpleNamespace
+) -> Tuple[NDArray, Dict[str, NDArray]]:
+    """An infinitesimally thin ring's visibility derivatives with respect to
+    the spatial frequency and the radius (in its unit)."""
+    rin = get_param_value(params.rin).to(u.rad).value
+    dvis = -2 * np.pi * j1(2 * np.pi * rin * spf).astype(complex)
+    return dvis * rin, {"rin": dvis * spf * u.Unit(params.rin.unit).to(u.rad)}
+
+
 def Iring_img(rho: NDArray, phi: NDArray, params: SimpleNamespace) -> NDArray:
     """An infinitesimally thin ring's image."""
     rin = get_param_value(params.rin).value
@@ -1,16 +1,30 @@
 from types import SimpleNamespace
-from typing import Tuple
+from typing import List, Tuple
 
 import astropy.units as u
 import numpy as np
 from numpy.typing import NDArray
 
-from ..config.options import OPTIONS
+from .components import stack_components, stack_params
+from .convolve import convolve_image
+from .emulator import emulate_vis
+from .snapshot import ModelSnapshot
 from .utils import (
+    take_buffers,
+    to_polar,
     transform_coordinates,
+    transform_coordinates_jac,
     get_param_value,
 )
 
+# NOTE: The maximum number of grid points evaluated in one kernel call
+MAX_CHUNK_SIZE = 2**22
+
+# NOTE: The maximum number of image points of a group of components and
+# of the tiles they are evaluated in, which keeps the temporaries in the cache
+MAX_IMAGE_CHUNK_SIZE = 2**20
+MAX_TILE_SIZE = 2**16
+
 
 def translate_vis(
     ucoord: np.ndarray, vcoord: np.ndarray, params: SimpleNamespace
@@ -18,43 +32,259 @@ def translate_vis(
     """Translation in Fourier space."""
     x = get_param_value(params.x).to(u.rad).value
     y = get_param_value(params.y).to(u.rad).value
+    return np.exp(-2j * np.pi * (x * ucoord + y * vcoord))
 
-    condition = [
-        comp.params.fr.value != 0 for comp in OPTIONS.model.components.current.values()
-    ]
-    if len(OPTIONS.model.components.current) <= 1 or np.sum(condition) <= 1:
-        return np.ones_like(ucoord).astype(complex)
 
-    return np.exp(-2j * np.pi * (x * ucoord + y * vcoord))
+def get_orientation(group: SimpleNamespace) -> Tuple[NDArray | None, NDArray | None]:
+    """Gets the (stacked) cosine of inclination and positional angle of a group."""
+    if group.name in ["point", "background"]:
+        return None, None
+    return (
+        get_param_value(group.params.cinc).value,
+        get_param_value(group.params.pa).value,
+    )
 
 
 def compute_complex_vis(
-    components: SimpleNamespace, ucoord: NDArray, wl: NDArray
+    snapshot: ModelSnapshot,
+    ucoord: NDArray | None = None,
+    wl: NDArray | None = None,
+    vcoord: NDArray | None = None,
 ) -> Tuple[NDArray, NDArray]:
-    """Computes the complex visibility of the model."""
-    complex_vis = []
-    for component in components.values():
-        fr = get_param_value(component.params.fr).value
-        if component.name in ["point", "background"]:
-            cinc, pa = None, None
-        else:
-            cinc = get_param_value(component.params.cinc).value
-            pa = get_param_value(component.params.pa).value
+    """Computes the complex visibility of the model.
 
-        utb, vtb = map(
-            lambda x: x / wl, transform_coordinates(ucoord, ucoord, cinc, pa)
-        )
-        shift = translate_vis(utb, vtb, component.params)
-        vis = component.vis(np.hypot(utb, vtb), np.arctan2(utb, vtb), component.params)
-        complex_vis.append(fr * vis * shift)
+    If no uv-coordinates are given the snapshot's grid is used and
+    if no vcoord is given the visibility is computed along the u = v diagonal.
+    The wavelength can either be a scalar or one value per uv-point.
+    Components of the same type are evaluated together in one kernel call.
+    Parameters holding several values (e.g., samples) result in leading axes.
+    """
+    ucoord = snapshot.u if ucoord is None else ucoord
+    vcoord = ucoord if vcoord is None else vcoord
+    wl = snapshot.wl if wl is None else wl
+    ucoord, vcoord = np.broadcast_arrays(ucoord / wl, vcoord / wl)
+
+    ndim = ucoord.ndim
+    params = stack_params(snapshot.components, ["x", "y", "fr"], ndim)
+    fluxes = get_param_value(params.fr).value
+    # NOTE: Only translate (samples of) models with several components with flux
+    shift, shifted = None, np.count_nonzero(fluxes, axis=0) > 1
+    if fluxes.shape[0] > 1 and shifted.any():
+        shift = translate_vis(ucoord, vcoord, params)
+        if not shifted.all():
+            shift = np.where(shifted, shift, 1)
+
+    complex_vis = np.zeros(fluxes.shape[1:-ndim] + ucoord.shape, dtype=complex)
+    chunk = max(1, MAX_CHUNK_SIZE // max(ucoord.size, 1))
+    coords, polar = np.empty(0), np.empty(0)
+    for group in stack_components(snapshot.components, ndim, chunk):
+        cinc, pa = get_orientation(group)
+        shape = np.broadcast_shapes(np.shape(cinc), ucoord.shape)
+        coords, out = take_buffers(coords, shape)
+        utb, vtb = transform_coordinates(ucoord, vcoord, cinc, pa, out=out)
+        polar, out = take_buffers(polar, shape)
+        spf, psi = to_polar(utb, vtb, out)
+        if snapshot.emulator is not None:
+            vis = emulate_vis(group, spf, psi, snapshot.emulator)
+        else:
+            vis = group.vis(spf, psi, group.params)
+        vis = vis * fluxes[group.indices]
+        if shift is not None:
+            vis *= shift[group.indices]
+        complex_vis += vis.sum(axis=0)
 
-    complex_vis = np.sum(complex_vis, axis=0)
-    complex_vis /= complex_vis[0]
+    complex_vis /= fluxes.sum(axis=0)
     vis = np.abs(complex_vis)
-    vis = vis**2 if OPTIONS.settings.display.amplitude == "vis2" else vis
+    vis = vis**2 if snapshot.amplitude == "vis2" else vis
     return vis, np.angle(complex_vis, deg=True)
 
 
+def estimate_interpolation_error(x: NDArray, y: NDArray) -> NDArray:
+    """Estimates the error of linearly interpolating y between the
+    points x from the (local) second differences."""
+    widths = np.diff(x)
+    curvature = np.abs(2 * np.diff(np.diff(y) / widths) / (widths[:-1] + widths[1:]))
+    curvature = np.concatenate(([0], curvature, [0]))
+    return np.maximum(curvature[:-1], curvature[1:]) * widths**2 / 8
+
+
+def compute_adaptive_vis(
+    snapshot: ModelSnapshot,
+) -> Tuple[NDArray, NDArray, NDArray, NDArray]:
+    """Computes the visibility along the u = v diagonal on adaptively
+    refined baselines.
+
+    Starting from the snapshot's grid, the intervals in which the estimated
+    interpolation error of either the complex visibility or the amplitude
+    (e.g., close to nulls) exceeds the tolerance are bisected until the
+    tolerance or the maximum number of samples is reached.
+
+    Returns
+    -------
+    ucoord : numpy.ndarray
+        The refined u (= v) coordinates.
+    spf : numpy.ndarray
+        The refined effective baselines.
+    vis : numpy.ndarray
+        The amplitudes.
+    phase : numpy.ndarray
+        The phases.
+    """
+    baselines, ucoord = snapshot.baselines, snapshot.u
+    vis, phase = compute_complex_vis(snapshot)
+    scale = np.log if baselines.scale == "log" else np.asarray
+    min_width = np.ptp(scale(ucoord)) / (8 * baselines.max_samples)
+
+    while ucoord.size < baselines.max_samples:
+        x = scale(ucoord)
+        amplitude = np.sqrt(vis) if snapshot.amplitude == "vis2" else vis
+        complex_vis = amplitude * np.exp(1j * np.deg2rad(phase))
+        error = np.maximum(
+            estimate_interpolation_error(x, complex_vis),
+            estimate_interpolation_error(x, vis),
+        )
+        error[np.diff(x) < min_width] = 0
+
+        refine = np.argsort(error)[::-1][: baselines.max_samples - ucoord.size]
+        refine = refine[error[refine] > baselines.tolerance]
+        if refine.size == 0:
+            break
+
+        midpoints = (x[refine] + x[refine + 1]) / 2
+        new_ucoord = np.exp(midpoints) if baselines.scale == "log" else midpoints
+        new_vis, new_phase = compute_complex_vis(snapshot, new_ucoord)
+
+        ucoord = np.concatenate((ucoord, new_ucoord))
+        order = np.argsort(ucoord)
+        ucoord = ucoord[order]
+        vis = np.concatenate((vis, new_vis))[order]
+        phase = np.concatenate((phase, new_phase))[order]
+
+    return ucoord, np.hypot(*transform_coordinates(ucoord, ucoord)), vis, phase
+
+
+def compute_complex_vis_and_jacobian(
+    snapshot: ModelSnapshot,
+    ucoord: NDArray | None = None,
+    wl: NDArray | None = None,
+    vcoord: NDArray | None = None,
+) -> Tuple[NDArray, NDArray, List[Tuple[int, str]]]:
+    """Computes the complex visibility of the model and its analytic
+    derivatives with respect to all of the components' parameters.
+
+    The coordinates are handled as in compute_complex_vis.
+
+    Returns
+    -------
+    complex_vis : numpy.ndarray
+        The complex visibility (normalised by the total flux).
+    jacobian : numpy.ndarray
+        The derivatives of the complex visibility (n_params x n_uv) with
+        respect to the parameters (in their units).
+    labels : list of tuple
+        The component's index and the parameter's name for each row of
+        the jacobian.
+    """
+    ucoord = snapshot.u if ucoord is None else ucoord
+    vcoord = ucoord if vcoord is None else vcoord
+    wl = snapshot.wl if wl is None else wl
+    ucoord, vcoord = np.broadcast_arrays(ucoord / wl, vcoord / wl)
+
+    ndim = ucoord.ndim
+    params = stack_params(snapshot.components, ["x", "y", "fr"], ndim)
+    fluxes = get_param_value(params.fr).value
+    shifted = fluxes.shape[0] > 1 and np.count_nonzero(fluxes) > 1
+    if shifted:
+        shift = translate_vis(ucoord, vcoord, params)
+    else:
+        shift = np.ones(fluxes.shape[:1] + ucoord.shape, dtype=complex)
+
+    labels = [
+        (index, name)
+        for index, component in enumerate(snapshot.components)
+        for name in vars(component.params)
+    ]
+    rows = {label: row for row, label in enumerate(labels)}
+    jacobian = np.zeros((len(labels),) + ucoord.shape, dtype=complex)
+    terms = np.empty(shift.shape, dtype=complex)
+
+    chunk = max(1, MAX_CHUNK_SIZE // max(ucoord.size, 1))
+    for group in stack_components(snapshot.components, ndim, chunk):
+        cinc, pa = get_orientation(group)
+        utb, vtb = transform_coordinates(ucoord, vcoord, cinc, pa)
+        spf, psi = np.hypot(utb, vtb), np.arctan2(utb, vtb)
+        terms[group.indices] = group.vis(spf, psi, group.params) * shift[group.indices]
+        scale = fluxes[group.indices] * shift[group.indices]
+
+        dvis_dspf, derivatives = group.jac(spf, psi, group.params)
+        if cinc is not None:
+            for name, (dutb, dvtb) in transform_coordinates_jac(
+                ucoord, vcoord, cinc, pa
+            ).items():
+                dspf = np.divide(
+                    utb * dutb + vtb * dvtb,
+                    spf,
+                    out=np.zeros(spf.shape),
+                    where=spf != 0,
+                )
+                derivatives[name] = dvis_dspf * dspf
+
+        for name, derivative in derivatives.items():
+            jacobian[[rows[(index, name)] for index in group.indices]] = (
+                scale * derivative
+            )
+
+    total_flux = fluxes.sum()
+    complex_vis = (fluxes * terms).sum(axis=0) / total_flux
+    jacobian /= total_flux
+
+    indices = range(fluxes.shape[0])
+    jacobian[[rows[(index, "fr")] for index in indices]] = (
+        terms - complex_vis
+    ) / total_flux
+    if shifted:
+        for name, coord in [("x", ucoord), ("y", vcoord)]:
+            factor = u.Unit(getattr(params, name).unit).to(u.rad)
+            jacobian[[rows[(index, name)] for index in indices]] = (
+                -2j * np.pi * factor * coord * fluxes * terms / total_flux
+            )
+
+    return complex_vis, jacobian, labels
+
+
+def mirror_half_plane(half: NDArray, sign: int = 1) -> NDArray:
+    """Mirrors a quantity computed on the upper half of the uv-plane
+    to the full plane (for phases the sign is flipped).
+
+    The half-plane's first row must be v = 0 and its u-axis symmetric.
+    """
+    return np.concatenate((sign * half[:0:-1, ::-1], half), axis=0)
+
+
+def compute_uv_map(
+    snapshot: ModelSnapshot,
+    uu: NDArray | None = None,
+    vv: NDArray | None = None,
+    wl: NDArray | None = None,
+) -> Tuple[NDArray, NDArray]:
+    """Computes the amplitude and phase maps of the full uv-plane.
+
+    Only the upper half-plane (v >= 0) is computed, the lower half is
+    given by the Hermitian symmetry V(-u, -v) = V*(u, v).
+
+    Raises
+    ------
+    ValueError
+        If the half-plane's grid does not start at v = 0.
+    """
+    uu = snapshot.uu if uu is None else uu
+    vv = snapshot.vv if vv is None else vv
+    if np.any(vv[0] != 0):
+        raise ValueError("The half-plane's grid must start at v = 0.")
+    vis, phase = compute_complex_vis(snapshot, uu, wl, vv)
+    return mirror_half_plane(vis), mirror_half_plane(phase, -1)
+
+
 def translate_img(x: np.ndarray, y: np.ndarray, params: SimpleNamespace) -> Tuple:
     """Shifts the coordinates in image space according to an offset."""
     x0 = get_param_value(params.x).value
@@ -62,20 +292,43 @@ def translate_img(x: np.ndarray, y: np.ndarray, params: SimpleNamespace) -> Tupl
     return x - x0, y - y0
 
 
-def compute_image(components: SimpleNamespace, xx: NDArray, yy: NDArray) -> NDArray:
-    """Computes the image of the model."""
-    image = []
-    for component in components.values():
-        fr = get_param_value(component.params.fr).value
-        xs, ys = translate_img(xx, yy, component.params)
-        if component.name in ["point", "background"]:
-            cinc, pa = None, None
-        else:
-            cinc = get_param_value(component.params.cinc).value
-            pa = get_param_value(component.params.pa).value
+def compute_image(
+    snapshot: ModelSnapshot, xx: NDArray | None = None, yy: NDArray | None = None
+) -> NDArray:
+    """Computes the image of the model.
+
+    If no coordinates are given the snapshot's image grid is used.
+    Components of the same type are evaluated together in one kernel call.
+    If the snapshot has a beam, the image is convolved with it.
+    """
+    xx = snapshot.xx if xx is None else xx
+    yy = snapshot.yy if yy is None else yy
+    image = np.zeros(xx.shape)
+    chunk = max(1, MAX_IMAGE_CHUNK_SIZE // xx.size)
+    coords, polar = np.empty(0), np.empty(0)
+    for group in stack_components(snapshot.components, xx.ndim, chunk):
+        fr = get_param_value(group.params.fr).value
+        cinc, pa = get_orientation(group)
+        img = np.empty(fr.shape[: -xx.ndim] + xx.shape)
+
+        # NOTE: Evaluate cache-sized tiles of rows (the point source needs the
+        # whole grid to find its nearest pixel)
+        rows = max(1, MAX_TILE_SIZE // (img.size // xx.shape[0]))
+        rows = xx.shape[0] if group.name == "point" else rows
+        for start in range(0, xx.shape[0], rows):
+            tile = slice(start, start + rows)
+            xs, ys = translate_img(xx[tile], yy[tile], group.params)
+            shape = np.broadcast_shapes(xs.shape, np.shape(cinc))
+            coords, out = take_buffers(coords, shape)
+            xt, yt = transform_coordinates(xs, ys, cinc, pa, axis="x", out=out)
+            polar, out = take_buffers(polar, shape)
+            rho, phi = to_polar(xt, yt, out)
+            img[..., tile, :] = group.img(rho, phi, group.params)
 
-        xt, yt = transform_coordinates(xs, ys, cinc, pa, axis="x")
-        img = component.img(np.hypot(xt, yt), np.arctan2(xt, yt), component.params)
-        image.append(fr * img / img.max())
+        img *= fr / img.max(axis=tuple(range(1, img.ndim)), keepdims=True)
+        image += img.sum(axis=0)
 
-    return np.sum(image, axis=0)
+    if snapshot.beam is not None:
+        pixel_size = abs(xx[0, 1] - xx[0, 0])
+        image = convolve_image(image, pixel_size, snapshot.beam, snapshot.wl)
+    return image
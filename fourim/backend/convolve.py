@@ -0,0 +1,104 @@
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Tuple
+
+import astropy.units as u
+import numpy as np
+from numpy.typing import NDArray
+from scipy import fft
+
+
+@lru_cache(maxsize=16)
+def compute_transfer_function(
+    shape: Tuple[int, int],
+    pixel_size: float,
+    kind: str,
+    fwhm: float,
+    diameter: float,
+    wl: float,
+) -> NDArray:
+    """Computes the transfer function of a beam on the real-to-complex
+    frequency grid of an image.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        The shape of the image.
+    pixel_size : float
+        The pixel size (mas).
+    kind : str
+        The beam, either "gauss" or "airy".
+    fwhm : float
+        The full width at half maximum of the gaussian beam (mas).
+    diameter : float
+        The telescope's diameter of the airy beam (m).
+    wl : float
+        The wavelength (m).
+
+    Returns
+    -------
+    transfer : numpy.ndarray
+        The (read-only) transfer function (shape[0] x shape[1] // 2 + 1),
+        normalised to one at zero frequency.
+    """
+    freq = np.hypot(
+        fft.fftfreq(shape[0], d=pixel_size)[:, None],
+        fft.rfftfreq(shape[1], d=pixel_size),
+    )
+    if kind == "gauss":
+        sigma = fwhm / (2 * np.sqrt(2 * np.log(2)))
+        transfer = np.exp(-2 * (np.pi * sigma * freq) ** 2)
+    elif kind == "airy":
+        # NOTE: The autocorrelation of a circular pupil
+        cutoff = diameter / wl * u.mas.to(u.rad)
+        rho = np.minimum(freq / cutoff, 1)
+        transfer = 2 / np.pi * (np.arccos(rho) - rho * np.sqrt(1 - rho**2))
+    else:
+        raise ValueError(f"Unknown beam '{kind}', use 'gauss' or 'airy'.")
+
+    transfer.setflags(write=False)
+    return transfer
+
+
+def get_beam_fwhm(beam: SimpleNamespace, wl: float | NDArray) -> float:
+    """Gets the full width at half maximum (mas) of a beam at the (mean)
+    wavelength."""
+    if beam.kind == "airy":
+        return 1.029 * float(np.mean(wl)) / beam.diameter * u.rad.to(u.mas)
+    return beam.fwhm
+
+
+def convolve_image(
+    image: NDArray,
+    pixel_size: float,
+    beam: SimpleNamespace,
+    wl: float | NDArray,
+    workers: int = -1,
+) -> NDArray:
+    """Convolves an image with a beam by multiplying its (real) Fourier
+    transform with the beam's cached transfer function.
+
+    The image is zero padded to (at least) twice its size, so the
+    convolution does not wrap around the edges. The airy beam is
+    computed at the (mean) wavelength.
+
+    Raises
+    ------
+    ValueError
+        If the beam is larger than the image.
+    """
+    shape = image.shape[-2:]
+    field, fwhm = pixel_size * min(shape), get_beam_fwhm(beam, wl)
+    if fwhm > field:
+        raise ValueError(
+            f"The beam ({fwhm:.1f} mas) is larger than the image ({field:.1f} mas)."
+        )
+
+    padded = tuple(fft.next_fast_len(2 * dim, real=True) for dim in shape)
+    transfer = compute_transfer_function(
+        padded, pixel_size, beam.kind, beam.fwhm, beam.diameter, float(np.mean(wl))
+    )
+    spectrum = fft.rfft2(image, s=padded, workers=workers)
+    spectrum *= transfer
+    convolved = fft.irfft2(spectrum, s=padded, workers=workers)
+    return convolved[..., : shape[0], : shape[1]]
@@ -0,0 +1,120 @@
+from typing import Callable, Dict, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+def lttb(x: NDArray, y: NDArray, n_out: int) -> NDArray:
+    """Decimates (sorted) data with the Largest-Triangle-Three-Buckets algorithm.
+
+    Returns
+    -------
+    indices : numpy.ndarray
+        The indices of the selected points (always including the first
+        and last point).
+    """
+    if n_out >= x.size or n_out < 3:
+        return np.arange(x.size)
+
+    edges = np.linspace(1, x.size - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype=int)
+    indices[0], indices[-1] = 0, x.size - 1
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < edges.size else x.size
+        x_mean = x[end:next_end].mean()
+        y_mean = y[end:next_end].mean()
+
+        previous = indices[bucket]
+        areas = np.abs(
+            (x[previous] - x_mean) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (y_mean - y[previous])
+        )
+        indices[bucket + 1] = start + np.argmax(areas)
+    return indices
+
+
+def minmax(x: NDArray, y: NDArray, n_out: int) -> NDArray:
+    """Decimates (sorted) data by keeping the minimum and maximum of each bin.
+
+    Returns
+    -------
+    indices : numpy.ndarray
+        The indices of the selected points.
+    """
+    n_bins = (n_out - 2) // 2
+    if n_out >= x.size or n_bins < 1:
+        return np.arange(x.size)
+
+    edges = np.linspace(0, x.size, n_bins + 1).astype(int)
+    bins = np.repeat(np.arange(n_bins), np.diff(edges))
+    order = np.lexsort((y, bins))
+    indices = np.concatenate(
+        ([0, x.size - 1], order[edges[:-1]], order[edges[1:] - 1])
+    )
+    return np.unique(indices)
+
+
+METHODS: Dict[str, Callable] = {"lttb": lttb, "minmax": minmax}
+
+
+class DecimatedData:
+    """A data set with precomputed decimations at several levels of detail.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        The x-values.
+    y : numpy.ndarray
+        The y-values.
+    yerr : numpy.ndarray, optional
+        The errors of the y-values.
+    target : int, optional
+        The number of points to display.
+    method : str, optional
+        The decimation method, either "lttb" or "minmax".
+
+    Attributes
+    ----------
+    levels : list of numpy.ndarray
+        The indices of the decimated data from the coarsest to the finest
+        level (each four times as many points as the previous one).
+    """
+
+    def __init__(
+        self,
+        x: NDArray,
+        y: NDArray,
+        yerr: Optional[NDArray] = None,
+        target: int = 2000,
+        method: str = "lttb",
+    ) -> None:
+        """The class's initialiser."""
+        order = np.argsort(x, kind="stable")
+        self.x, self.y = np.asarray(x)[order], np.asarray(y)[order]
+        self.yerr = None if yerr is None else np.asarray(yerr)[order]
+        self.target, self.decimate = target, METHODS[method]
+
+        self.levels, n_out = [], target
+        while n_out < self.x.size:
+            self.levels.append(self.decimate(self.x, self.y, n_out))
+            n_out *= 4
+
+    def select(self, xmin: float = -np.inf, xmax: float = np.inf) -> NDArray:
+        """Selects the indices of the points to display within a view range.
+
+        Uses the coarsest precomputed level that still has the target number
+        of points in the range and the full data when zoomed in far enough.
+        """
+        start = np.searchsorted(self.x, xmin, side="left")
+        end = np.searchsorted(self.x, xmax, side="right")
+        if end - start <= self.target:
+            return np.arange(start, end)
+
+        for level in self.levels:
+            lower, upper = np.searchsorted(level, [start, end])
+            if upper - lower >= self.target:
+                return level[lower:upper]
+
+        indices = self.decimate(self.x[start:end], self.y[start:end], self.target)
+        return start + indices
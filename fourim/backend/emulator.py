@@ -0,0 +1,127 @@
+import threading
+from types import SimpleNamespace
+
+import astropy.units as u
+import numpy as np
+from numpy.typing import NDArray
+
+from ..config.options import OPTIONS
+from .components import make_component
+from .snapshot import FrozenNamespace, freeze_component
+
+EMULATORS, LOCK = {}, threading.Lock()
+
+
+class Emulator:
+    """A precomputed table of a component's visibility that is evaluated by
+    linear interpolation instead of calling the exact kernel.
+
+    Only components whose visibility depends on the spatial frequency and
+    the size through their product alone (q = spf * size in rad) can be
+    emulated, so the table spans q only.
+
+    Parameters
+    ----------
+    name : str
+        The component's name.
+    param : str
+        The name of the component's size parameter.
+    frequencies : numpy.ndarray
+        The (equidistant) normalised spatial frequencies of the table.
+    table : numpy.ndarray
+        The visibilities at the normalised spatial frequencies.
+    error : float
+        The maximum absolute error of the interpolation.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        param: str,
+        frequencies: NDArray,
+        table: NDArray,
+        error: float,
+    ) -> None:
+        """The class's initialiser."""
+        self.name, self.param, self.error = name, param, error
+        self.frequencies, self.table = frequencies, table
+        self.slopes = np.diff(table, append=table[-1:])
+        self.step = frequencies[1] - frequencies[0]
+
+    def normalise(self, spf: NDArray, params: SimpleNamespace) -> NDArray:
+        """Normalises the spatial frequency by the size."""
+        param = getattr(params, self.param)
+        return spf * param.value * u.Unit(param.unit).to(u.rad)
+
+    def covers(self, spf: NDArray, params: SimpleNamespace) -> bool:
+        """Checks if the normalised spatial frequencies are within the table."""
+        return np.max(np.abs(self.normalise(spf, params))) <= self.frequencies[-1]
+
+    def vis(self, spf: NDArray, psi: NDArray, params: SimpleNamespace) -> NDArray:
+        """The interpolated visibility (see the components' vis functions)."""
+        index = np.abs(self.normalise(spf, params)) / self.step
+        lower = np.clip(index.astype(int), 0, self.frequencies.size - 1)
+        vis = np.take(self.table, lower) + np.take(self.slopes, lower) * (index - lower)
+        return vis.astype(complex)
+
+
+def get_size_param(name: str) -> SimpleNamespace:
+    """Gets the (default) size parameter of a component."""
+    avail = OPTIONS.model.components.avail
+    return getattr(OPTIONS.model.params, getattr(avail, name)[0])
+
+
+def compute_table(name: str, frequencies: NDArray) -> NDArray:
+    """Computes the exact visibilities of a component at the normalised
+    spatial frequencies."""
+    component = freeze_component(make_component(name))
+    param = getattr(component.params, get_size_param(name).name)
+    params = FrozenNamespace(
+        **{**vars(component.params), param.name: param._replace(value=1.0)}
+    )
+    spf = frequencies / u.Unit(param.unit).to(u.rad)
+    return component.vis(spf, np.zeros_like(spf), params).real
+
+
+def make_emulator(name: str, settings: SimpleNamespace) -> Emulator:
+    """Makes a component's emulator and estimates its error at the
+    midpoints of the table."""
+    param = get_size_param(name)
+    frequencies = np.linspace(0, settings.max_frequency, settings.frequencies)
+    emulator = Emulator(
+        name, param.name, frequencies, compute_table(name, frequencies), 0
+    )
+
+    midpoints = frequencies[:-1] + np.diff(frequencies) / 2
+    params = SimpleNamespace(**{param.name: SimpleNamespace(value=1, unit=param.unit)})
+    spf = midpoints / u.Unit(param.unit).to(u.rad)
+    emulator.error = float(
+        np.abs(emulator.vis(spf, None, params) - compute_table(name, midpoints)).max()
+    )
+    return emulator
+
+
+def get_emulator(name: str, settings: SimpleNamespace) -> Emulator | None:
+    """Gets a component's emulator if one is configured and it is within
+    the component's accuracy tolerance."""
+    if name not in settings.tolerance:
+        return None
+
+    key = (name, settings.frequencies, settings.max_frequency)
+    with LOCK:
+        if key not in EMULATORS:
+            EMULATORS[key] = make_emulator(name, settings)
+
+    emulator = EMULATORS[key]
+    return emulator if emulator.error <= settings.tolerance[name] else None
+
+
+def emulate_vis(
+    group: SimpleNamespace, spf: NDArray, psi: NDArray, settings: SimpleNamespace
+) -> NDArray:
+    """Evaluates the visibility of a (stacked) group of components with its
+    emulator or falls back to the exact kernel."""
+    emulator = get_emulator(group.name, settings)
+    if emulator is None or not emulator.covers(spf, group.params):
+        return group.vis(spf, psi, group.params)
+    return emulator.vis(spf, psi, group.params)
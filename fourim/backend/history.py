@@ -0,0 +1,142 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .components import make_component
+from .snapshot import ModelSnapshot
+
+
+def encode_components(
+    components: Iterable[SimpleNamespace],
+) -> Tuple[Tuple[str, ...], NDArray]:
+    """Encodes the components as their names and an array of the
+    parameters' values and uncertainties (n_params x 2)."""
+    components = list(components)
+    values = [
+        (param.value, param.sigma)
+        for component in components
+        for param in vars(component.params).values()
+    ]
+    names = tuple(component.name for component in components)
+    return names, np.array(values, dtype=float).reshape(-1, 2)
+
+
+def decode_components(names: Tuple[str, ...], values: NDArray) -> Dict:
+    """Makes the components from their encoded names and parameters."""
+    components, values = {}, iter(values)
+    for index, name in enumerate(names):
+        components[index] = make_component(name)
+        for param in vars(components[index].params).values():
+            param.value, param.sigma = map(float, next(values))
+    return components
+
+
+def snapshot_key(snapshot: ModelSnapshot, *settings: Any) -> Tuple:
+    """Makes a hashable key of a snapshot (and further settings that
+    the results depend on) to cache its results."""
+    names, values = encode_components(snapshot.components)
+    return (
+        names,
+        values.tobytes(),
+        repr(snapshot.wl),
+        tuple(vars(snapshot.baselines).items()),
+        snapshot.xx.shape,
+        snapshot.uu.shape,
+        snapshot.amplitude,
+        snapshot.one_dimensional,
+        repr(snapshot.emulator),
+        repr(snapshot.beam),
+        *settings,
+    )
+
+
+def get_nbytes(results: Any) -> int:
+    """Gets the memory used by the arrays in (nested) results."""
+    if isinstance(results, np.ndarray):
+        return results.nbytes
+    if isinstance(results, dict):
+        return sum(map(get_nbytes, results.values()))
+    if isinstance(results, (tuple, list)):
+        return sum(map(get_nbytes, results))
+    return 0
+
+
+class History:
+    """An undo/redo history of the model's states and a bounded cache
+    of their computed results.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        The maximum number of states kept in the history.
+    memory_budget : int, optional
+        The maximum memory (in bytes) of the cached results. The oldest
+        results are evicted first.
+
+    Attributes
+    ----------
+    entries : list of types.SimpleNamespace
+        The states, each the components' names and parameter values.
+    position : int
+        The index of the current state.
+    results : collections.OrderedDict
+        The cached results by their snapshot key.
+    nbytes : int
+        The memory used by the cached results.
+    """
+
+    def __init__(self, max_entries: int = 1000, memory_budget: int = 2**28) -> None:
+        """The class's initialiser."""
+        self.max_entries, self.memory_budget = max_entries, memory_budget
+        self.entries, self.position = [], -1
+        self.results, self.nbytes = OrderedDict(), 0
+
+    def record(self, components: Iterable[SimpleNamespace]) -> None:
+        """Records a state if it differs from the current one.
+
+        Discards the states that were undone before.
+        """
+        names, values = encode_components(components)
+        if self.position >= 0:
+            current = self.entries[self.position]
+            if current.names == names and np.array_equal(current.values, values):
+                return
+
+        del self.entries[self.position + 1 :]
+        self.entries.append(SimpleNamespace(names=names, values=values))
+        del self.entries[: -self.max_entries]
+        self.position = len(self.entries) - 1
+
+    def undo(self) -> Dict[int, SimpleNamespace] | None:
+        """Steps back in the history and returns the previous components."""
+        if self.position <= 0:
+            return None
+        self.position -= 1
+        return decode_components(**vars(self.entries[self.position]))
+
+    def redo(self) -> Dict[int, SimpleNamespace] | None:
+        """Steps forward in the history and returns the next components."""
+        if self.position >= len(self.entries) - 1:
+            return None
+        self.position += 1
+        return decode_components(**vars(self.entries[self.position]))
+
+    def cache(self, key: Tuple, results: Dict) -> None:
+        """Caches the results and evicts the oldest ones above the memory budget."""
+        if key in self.results:
+            self.nbytes -= get_nbytes(self.results.pop(key))
+
+        self.results[key] = results
+        self.nbytes += get_nbytes(results)
+        while self.nbytes > self.memory_budget and len(self.results) > 1:
+            self.nbytes -= get_nbytes(self.results.popitem(last=False)[1])
+
+    def lookup(self, key: Tuple) -> Dict | None:
+        """Looks up the cached results of a state."""
+        if key not in self.results:
+            return None
+        self.results.move_to_end(key)
+        return self.results[key]
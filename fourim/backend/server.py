@@ -0,0 +1,299 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import OrderedDict, deque
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..config.options import OPTIONS
+from .components import make_component
+from .compute import compute_complex_vis
+from .snapshot import ModelSnapshot, take_snapshot
+
+
+def make_model(spec: List[Dict]) -> ModelSnapshot:
+    """Makes a model snapshot from a request's specification.
+
+    Each entry of the specification contains the component's name and
+    optionally its parameter values (in the parameters' default units).
+    """
+    components = {}
+    for index, entry in enumerate(spec):
+        component = make_component(entry["name"])
+        for name, value in entry.get("params", {}).items():
+            getattr(component.params, name).value = float(value)
+        components[index] = component
+    return take_snapshot(components)
+
+
+class ModelServer:
+    """A long-running model evaluation service.
+
+    Keeps the grids, the component registry and the built models warm and
+    micro-batches concurrent requests for the same model into a single
+    vectorised computation.
+
+    Parameters
+    ----------
+    batch_window : float, optional
+        The time (in s) to wait for further requests after the first one
+        of a batch has arrived.
+    max_batch_points : int, optional
+        The maximum number of uv-points computed in a single batch.
+    max_models : int, optional
+        The maximum number of built models kept in the cache.
+    max_line_size : int, optional
+        The maximum size (in bytes) of a request's line.
+
+    Attributes
+    ----------
+    models : collections.OrderedDict
+        The cache of the built model snapshots.
+    stats : types.SimpleNamespace
+        The throughput and latency counters.
+    """
+
+    def __init__(
+        self,
+        batch_window: float = 2e-3,
+        max_batch_points: int = 2**18,
+        max_models: int = 128,
+        max_line_size: int = 2**28,
+    ) -> None:
+        """The class's initialiser."""
+        self.batch_window = batch_window
+        self.max_batch_points = max_batch_points
+        self.max_models = max_models
+        self.max_line_size = max_line_size
+        self.models = OrderedDict()
+        self.stats = SimpleNamespace(
+            start=time.perf_counter(),
+            requests=0,
+            points=0,
+            batches=0,
+            latencies=deque(maxlen=10000),
+        )
+        self._queue, self._batcher = None, None
+
+    def get_model(self, spec: List[Dict]) -> Tuple[str, ModelSnapshot]:
+        """Gets a model from the cache or builds it."""
+        key = json.dumps(spec, sort_keys=True)
+        if key in self.models:
+            self.models.move_to_end(key)
+        else:
+            self.models[key] = make_model(spec)
+            if len(self.models) > self.max_models:
+                self.models.popitem(last=False)
+        return key, self.models[key]
+
+    async def evaluate(
+        self,
+        spec: List[Dict],
+        ucoord: NDArray,
+        vcoord: NDArray,
+        wl: float | NDArray,
+        amplitude: str = "vis",
+    ) -> Tuple[NDArray, NDArray]:
+        """Evaluates the model at the given uv-points (in m) and wavelengths (in m).
+
+        Can be awaited directly as an in-process stand-in for the server.
+        The inputs are validated before they are batched, so an invalid
+        request only fails itself. The results have the shape of the
+        uv-points.
+        """
+        ucoord = np.atleast_1d(np.asarray(ucoord, dtype=float))
+        vcoord = np.atleast_1d(np.asarray(vcoord, dtype=float))
+        wl = np.asarray(wl, dtype=float)
+        if ucoord.shape != vcoord.shape:
+            raise ValueError(
+                f"The shapes of u {ucoord.shape} and v {vcoord.shape} differ."
+            )
+        if wl.ndim > 0 and wl.shape != ucoord.shape:
+            raise ValueError(
+                f"The shape of wl {wl.shape} differs from the uv-points' "
+                f"{ucoord.shape}."
+            )
+        if amplitude not in ["vis", "vis2"]:
+            raise ValueError(f"Unknown amplitude '{amplitude}', use 'vis' or 'vis2'.")
+
+        if self._batcher is None or self._batcher.done():
+            self._queue = asyncio.Queue()
+            self._batcher = asyncio.create_task(self._run_batches())
+
+        key, snapshot = self.get_model(spec)
+        request = SimpleNamespace(
+            key=key,
+            snapshot=snapshot._replace(amplitude=amplitude),
+            amplitude=amplitude,
+            shape=ucoord.shape,
+            ucoord=ucoord.ravel(),
+            vcoord=vcoord.ravel(),
+            wl=np.broadcast_to(wl, ucoord.shape).ravel(),
+            start=time.perf_counter(),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        await self._queue.put(request)
+        return await request.future
+
+    async def _run_batches(self) -> None:
+        """Collects the queued requests into batches and computes them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            requests = [await self._queue.get()]
+            points = requests[0].ucoord.size
+            deadline = loop.time() + self.batch_window
+            while points < self.max_batch_points:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                requests.append(request)
+                points += request.ucoord.size
+
+            batches = {}
+            for request in requests:
+                batches.setdefault((request.key, request.amplitude), []).append(
+                    request
+                )
+
+            for batch in batches.values():
+                try:
+                    ucoord, vcoord, wl = (
+                        np.concatenate([getattr(request, key) for request in batch])
+                        for key in ["ucoord", "vcoord", "wl"]
+                    )
+                    vis, phase = await loop.run_in_executor(
+                        None,
+                        compute_complex_vis,
+                        batch[0].snapshot,
+                        ucoord,
+                        wl,
+                        vcoord,
+                    )
+                except Exception as error:
+                    for request in batch:
+                        request.future.set_exception(error)
+                    continue
+
+                self.stats.batches += 1
+                splits = np.cumsum([request.ucoord.size for request in batch])[:-1]
+                for request, v, p in zip(
+                    batch, np.split(vis, splits), np.split(phase, splits)
+                ):
+                    self.stats.requests += 1
+                    self.stats.points += request.ucoord.size
+                    self.stats.latencies.append(time.perf_counter() - request.start)
+                    request.future.set_result(
+                        (v.reshape(request.shape), p.reshape(request.shape))
+                    )
+
+    def statistics(self) -> Dict[str, float]:
+        """Gets the throughput and latency statistics of the server."""
+        elapsed = time.perf_counter() - self.stats.start
+        latencies = np.array(self.stats.latencies) * 1e3
+        statistics = {
+            "uptime": elapsed,
+            "requests": self.stats.requests,
+            "points": self.stats.points,
+            "batches": self.stats.batches,
+            "requests_per_second": self.stats.requests / elapsed,
+            "points_per_second": self.stats.points / elapsed,
+            "requests_per_batch": self.stats.requests / max(self.stats.batches, 1),
+        }
+        if latencies.size:
+            statistics["latency_mean_ms"] = latencies.mean()
+            for percentile in [50, 95, 99]:
+                statistics[f"latency_p{percentile}_ms"] = np.percentile(
+                    latencies, percentile
+                )
+        return {key: float(value) for key, value in statistics.items()}
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Handles a client connection.
+
+        The protocol consists of newline-delimited json objects. A request
+        either has the operation "evaluate" (with the keys "model", "u", "v",
+        "wl" and optionally "amplitude") or "stats". A line exceeding the
+        maximum line size is answered with an error and closes the connection.
+        """
+
+        async def respond(line: bytes) -> None:
+            request = None
+            try:
+                request = json.loads(line)
+                if request.get("op", "evaluate") == "stats":
+                    response = self.statistics()
+                else:
+                    vis, phase = await self.evaluate(
+                        request["model"],
+                        request["u"],
+                        request["v"],
+                        request.get("wl", OPTIONS.model.wl),
+                        request.get("amplitude", "vis"),
+                    )
+                    response = {"vis": vis.tolist(), "phase": phase.tolist()}
+            except Exception as error:
+                response = {"error": f"{type(error).__name__}: {error}"}
+
+            response["id"] = request.get("id") if isinstance(request, dict) else None
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ValueError, asyncio.LimitOverrunError) as error:
+            response = {"error": f"{type(error).__name__}: {error}", "id": None}
+            writer.write(json.dumps(response).encode() + b"\n")
+        finally:
+            await asyncio.gather(*tasks)
+            writer.close()
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = 8765, path: str | None = None
+    ) -> asyncio.AbstractServer:
+        """Starts serving on localhost or a unix socket."""
+        if path is not None:
+            return await asyncio.start_unix_server(
+                self.handle, path=path, limit=self.max_line_size
+            )
+        return await asyncio.start_server(
+            self.handle, host=host, port=port, limit=self.max_line_size
+        )
+
+    async def serve(
+        self, host: str = "127.0.0.1", port: int = 8765, path: str | None = None
+    ) -> None:
+        """Serves the model evaluation on localhost or a unix socket."""
+        async with await self.start(host, port, path) as server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fourim's model evaluation server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", default=None, help="Path of a unix socket.")
+    parser.add_argument(
+        "--batch-window", type=float, default=2, help="The batch window in ms."
+    )
+    args = parser.parse_args()
+
+    server = ModelServer(batch_window=args.batch_window * 1e-3)
+    asyncio.run(server.serve(args.host, args.port, args.socket))
+
+
+if __name__ == "__main__":
+    main()
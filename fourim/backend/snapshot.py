@@ -0,0 +1,132 @@
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, NamedTuple, Tuple
+
+import astropy.units as u
+from numpy.typing import NDArray
+
+from ..config.options import OPTIONS
+
+
+class FrozenNamespace(SimpleNamespace):
+    """A simple namespace whose attributes can not be changed after creation."""
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"Cannot set attribute '{name}' of a frozen namespace.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Cannot delete attribute '{name}' of a frozen namespace.")
+
+
+class Parameter(NamedTuple):
+    """An immutable copy of a model parameter."""
+
+    name: str
+    value: float | NDArray
+    unit: u.Unit
+    min: float
+    max: float
+    sigma: float = 0.0
+
+
+class ComponentSnapshot(NamedTuple):
+    """An immutable copy of a model component."""
+
+    name: str
+    vis: Callable
+    img: Callable
+    jac: Callable
+    params: FrozenNamespace
+
+
+class ModelSnapshot(NamedTuple):
+    """An immutable snapshot of the model, its grids and the display settings.
+
+    The grids are shared (read-only) between the snapshots and only the
+    parameters are copied, which makes taking a snapshot cheap.
+    """
+
+    components: Tuple[ComponentSnapshot, ...]
+    wl: float | NDArray
+    baselines: FrozenNamespace
+    u: NDArray
+    spf: NDArray
+    xx: NDArray
+    yy: NDArray
+    max_im: float
+    uu: NDArray
+    vv: NDArray
+    uv_max: float
+    amplitude: str
+    one_dimensional: bool
+    emulator: FrozenNamespace | None = None
+    beam: FrozenNamespace | None = None
+
+
+def freeze_component(component: SimpleNamespace) -> ComponentSnapshot:
+    """Makes an immutable copy of a component."""
+    params = {
+        name: Parameter(
+            param.name, param.value, param.unit, param.min, param.max, param.sigma
+        )
+        for name, param in vars(component.params).items()
+    }
+    return ComponentSnapshot(
+        component.name,
+        component.vis,
+        component.img,
+        component.jac,
+        FrozenNamespace(**params),
+    )
+
+
+def freeze_settings(settings: SimpleNamespace) -> FrozenNamespace | None:
+    """Makes an immutable copy of optional settings if they are enabled."""
+    if not settings.enabled:
+        return None
+    return FrozenNamespace(
+        **{
+            name: dict(value) if isinstance(value, dict) else value
+            for name, value in vars(settings).items()
+        }
+    )
+
+
+def take_snapshot(
+    components: Dict[int, SimpleNamespace] | None = None, **kwargs
+) -> ModelSnapshot:
+    """Takes a snapshot of the current model.
+
+    Parameters
+    ----------
+    components : dict of types.SimpleNamespace, optional
+        The components to take the snapshot of. If not provided
+        the current model's components are used.
+    kwargs : dict, optional
+        Fields of the snapshot to replace, e.g., the amplitude.
+
+    Returns
+    -------
+    snapshot : ModelSnapshot
+    """
+    model, settings = OPTIONS.model, OPTIONS.settings
+    if components is None:
+        components = model.components.current
+
+    snapshot = ModelSnapshot(
+        components=tuple(map(freeze_component, components.values())),
+        wl=model.wl,
+        baselines=FrozenNamespace(**vars(model.baselines)),
+        u=model.u,
+        spf=model.spf,
+        xx=model.xx,
+        yy=model.yy,
+        max_im=model.max_im,
+        uu=model.uu,
+        vv=model.vv,
+        uv_max=model.uv_max,
+        amplitude=settings.display.amplitude,
+        one_dimensional=settings.display.one_dimensional,
+        emulator=freeze_settings(settings.emulator),
+        beam=freeze_settings(settings.beam),
+    )
+    return snapshot._replace(**kwargs)
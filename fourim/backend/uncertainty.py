@@ -0,0 +1,146 @@
+from typing import List, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.stats import truncnorm
+
+from .compute import compute_complex_vis
+from .snapshot import FrozenNamespace, ModelSnapshot
+
+
+class StreamingQuantiles:
+    """Streaming estimates of the mean and quantiles of bounded samples.
+
+    The samples are accumulated in fixed histograms (one per point),
+    so the memory is constant in the number of samples and the quantiles
+    are accurate to the bin width.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        The shape of a single sample.
+    lower : float
+        The lower bound of the samples.
+    upper : float
+        The upper bound of the samples.
+    bins : int, optional
+        The number of histogram bins.
+
+    Attributes
+    ----------
+    counts : numpy.ndarray
+        The histogram counts per point.
+    total : numpy.ndarray
+        The sum of the samples per point.
+    n : int
+        The number of samples.
+    """
+
+    def __init__(
+        self, shape: Tuple[int, ...], lower: float, upper: float, bins: int = 512
+    ) -> None:
+        """The class's initialiser."""
+        self.lower, self.upper, self.bins = lower, upper, bins
+        self.counts = np.zeros(shape + (bins,), dtype=np.int64)
+        self.total = np.zeros(shape)
+        self.n = 0
+
+    def update(self, samples: NDArray) -> None:
+        """Adds a batch of samples (n_samples, *shape) to the estimates."""
+        samples = samples.reshape((-1,) + self.total.shape)
+        indices = (samples - self.lower) / (self.upper - self.lower) * self.bins
+        indices = np.clip(indices.astype(int), 0, self.bins - 1)
+        indices += np.arange(self.total.size).reshape(self.total.shape) * self.bins
+        self.counts += np.bincount(
+            indices.ravel(), minlength=self.counts.size
+        ).reshape(self.counts.shape)
+        self.total += samples.sum(axis=0)
+        self.n += samples.shape[0]
+
+    def mean(self) -> NDArray:
+        """The mean of the samples."""
+        return self.total / self.n
+
+    def quantile(self, q: float | List[float]) -> NDArray:
+        """The (linearly interpolated) quantiles of the samples."""
+        width = (self.upper - self.lower) / self.bins
+        cdf = np.cumsum(self.counts, axis=-1) / self.n
+        quantiles = []
+        for value in np.atleast_1d(q):
+            index = np.argmax(cdf >= value, axis=-1)[..., None]
+            upper = np.take_along_axis(cdf, index, axis=-1)[..., 0]
+            counts = np.take_along_axis(self.counts, index, axis=-1)[..., 0] / self.n
+            fraction = np.divide(
+                value - (upper - counts),
+                counts,
+                out=np.zeros(counts.shape),
+                where=counts > 0,
+            )
+            quantiles.append(self.lower + (index[..., 0] + fraction) * width)
+        return np.array(quantiles)
+
+
+def sample_snapshot(
+    snapshot: ModelSnapshot, size: int, rng: np.random.Generator | None = None
+) -> ModelSnapshot:
+    """Draws samples of the parameters with an uncertainty (sigma > 0).
+
+    The parameters are drawn from normal distributions truncated to
+    their min/max bounds.
+    """
+    rng = np.random.default_rng(rng)
+    components = []
+    for component in snapshot.components:
+        params = {}
+        for name, param in vars(component.params).items():
+            if param.sigma > 0:
+                value = truncnorm.rvs(
+                    (param.min - param.value) / param.sigma,
+                    (param.max - param.value) / param.sigma,
+                    loc=param.value,
+                    scale=param.sigma,
+                    size=size,
+                    random_state=rng,
+                )
+            else:
+                value = np.full(size, param.value, dtype=float)
+            params[name] = param._replace(value=value)
+        components.append(component._replace(params=FrozenNamespace(**params)))
+    return snapshot._replace(components=tuple(components))
+
+
+def compute_uncertainty_bands(
+    snapshot: ModelSnapshot,
+    quantiles: List[float] = [0.16, 0.84],
+    samples: int = 1000,
+    batch_size: int = 100,
+    seed: int | None = None,
+) -> Tuple[NDArray, NDArray]:
+    """Computes the quantiles of the amplitudes and phases from Monte Carlo
+    samples of the parameters.
+
+    The samples are evaluated in batches and reduced with streaming
+    estimators, so the memory does not depend on the number of samples.
+    The phases are reduced circularly as their (wrapped) difference to the
+    nominal phase, so the phase bands may extend beyond ±180°.
+
+    Returns
+    -------
+    vis_bands : numpy.ndarray
+        The quantiles (n_quantiles x n_uv) of the amplitudes.
+    phase_bands : numpy.ndarray
+        The quantiles (n_quantiles x n_uv) of the phases.
+    """
+    rng = np.random.default_rng(seed)
+    shape = np.shape(snapshot.u)
+    vis_stats = StreamingQuantiles(shape, 0, 1)
+    phase_stats = StreamingQuantiles(shape, -180, 180)
+    _, nominal_phase = compute_complex_vis(snapshot)
+    for start in range(0, samples, batch_size):
+        batch = sample_snapshot(snapshot, min(batch_size, samples - start), rng)
+        vis, phase = compute_complex_vis(batch)
+        vis_stats.update(vis)
+        phase_stats.update((phase - nominal_phase + 180) % 360 - 180)
+
+    phase_bands = nominal_phase + phase_stats.quantile(quantiles)
+    return vis_stats.quantile(quantiles), phase_bands
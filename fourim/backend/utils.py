@@ -1,6 +1,7 @@
+import math
 import threading
 from types import SimpleNamespace
-from typing import Callable, Dict, Tuple
+from typing import Callable, Dict, Iterable, Tuple
 
 import numpy as np
 
@@ -17,42 +18,112 @@ def run_threaded(func: Callable, results: Dict, index: int | str, *args):
 
 
 def compare_angles(
-    angle1: float | np.ndarray, angle2: float | np.ndarray
+    angle1: float | np.ndarray,
+    angle2: float | np.ndarray,
+    out: np.ndarray | None = None,
 ) -> np.ndarray:
-    """Subtracts two angles and makes sure the are between -np.pi and +np.pi."""
-    diff = np.array([angle1 - angle2])
-    diff[diff > np.pi] -= 2 * np.pi
-    diff[diff < -np.pi] += 2 * np.pi
-    return diff
+    """Subtracts two angles and wraps the difference to [-np.pi, np.pi).
+
+    Parameters
+    ----------
+    angle1: float or numpy.ndarray
+        The first angle (in radian).
+    angle2: float or numpy.ndarray
+        The second angle (in radian).
+    out: numpy.ndarray, optional
+        An array (of the broadcast shape) to write the difference to.
+    """
+    if out is None:
+        out = np.empty(np.broadcast_shapes(np.shape(angle1), np.shape(angle2)))
+    np.subtract(angle1, angle2, out=out)
+    out += np.pi
+    np.remainder(out, 2 * np.pi, out=out)
+    out -= np.pi
+    return out
+
+
+def take_buffers(
+    buffer: np.ndarray, shape: Tuple[int, ...]
+) -> Tuple[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """Takes two arrays of a shape from the front of a flat scratch buffer.
+
+    Returns
+    -------
+    buffer : numpy.ndarray
+        The scratch buffer, replaced by a larger one if it was too small.
+    arrays : tuple of numpy.ndarray
+        The two arrays (views of the buffer).
+    """
+    size = math.prod(shape)
+    if buffer.size < 2 * size:
+        buffer = np.empty(2 * size)
+    arrays = buffer[:size].reshape(shape), buffer[size : 2 * size].reshape(shape)
+    return buffer, arrays
+
+
+def to_polar(
+    x: np.ndarray, y: np.ndarray, out: Tuple[np.ndarray, np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Computes the radius and the angle (from the y-axis) of coordinates.
+
+    Parameters
+    ----------
+    x: numpy.ndarray
+        The x-coordinate.
+    y: numpy.ndarray
+        The y-coordinate.
+    out: tuple of numpy.ndarray
+        Arrays (of the broadcast shape) to write the radius and angle to.
+        They must not share memory with the coordinates.
+    """
+    # NOTE: np.hypot is several times slower than the plain square root
+    rho, phi = out
+    np.multiply(x, x, out=rho)
+    np.multiply(y, y, out=phi)
+    rho += phi
+    np.sqrt(rho, out=rho)
+    np.arctan2(x, y, out=phi)
+    return rho, phi
+
+
+def get_model_label(components: Iterable[SimpleNamespace]) -> str:
+    """Gets a label of a model from its components' names."""
+    return " + ".join(component.name for component in components)
 
 
 def get_param_value(param: SimpleNamespace):
     return param.value * param.unit
 
 
-# TODO: Rewrite this with np.dot -> Should be faster
 def transform_coordinates(
     x: float | np.ndarray,
     y: float | np.ndarray,
-    cinc: float | None = None,
-    pa: float | None = None,
+    cinc: float | np.ndarray | None = None,
+    pa: float | np.ndarray | None = None,
     axis: str = "y",
+    out: Tuple[np.ndarray, np.ndarray] | None = None,
 ) -> Tuple[float | np.ndarray, float | np.ndarray]:
     """Stretches and rotates the coordinate space depending on the
     cosine of inclination and the positional angle.
 
+    The rotation and stretch are applied as one linear map whose
+    coefficients are computed once. The coordinates are never changed.
+
     Parameters
     ----------
-    x: float or numpy.ndarray or astropy.units.Quantity
+    x: float or numpy.ndarray
         The x-coordinate.
-    y: float or numpy.ndarray or astropy.units.Quantity
+    y: float or numpy.ndarray
         The y-coordinate.
-    cinc: float, optional
+    cinc: float or numpy.ndarray, optional
         The cosine of the inclination.
-    pa: float, optional
+    pa: float or numpy.ndarray, optional
         The positional angle of the object (in degree).
     axis: str, optional
         The axis to stretch the coordinates on.
+    out: tuple of numpy.ndarray, optional
+        Arrays (of the broadcast shape) to write the transformed
+        coordinates to. They must not share memory with the coordinates.
 
     Returns
     -------
@@ -61,17 +132,69 @@ def transform_coordinates(
     yt: float or numpy.ndarray
         Transformed y coordinate.
     """
-    if pa is not None:
-        pa = np.deg2rad(pa)
-        xt = x * np.cos(pa) - y * np.sin(pa)
-        yt = x * np.sin(pa) + y * np.cos(pa)
-    else:
-        xt, yt = x, y
-
+    stretch = 1
     if cinc is not None:
         if axis == "x":
-            xt /= cinc
+            stretch = 1 / cinc
         elif axis == "y":
-            xt *= cinc
+            stretch = cinc
+
+    if pa is None:
+        if out is None:
+            return (x, y) if cinc is None else (np.multiply(x, stretch), y)
+        np.multiply(x, stretch, out=out[0])
+        np.copyto(out[1], y)
+        return out
+
+    pa = np.deg2rad(pa)
+    cos, sin = np.cos(pa), np.sin(pa)
+    if out is None:
+        shape = np.broadcast_shapes(
+            np.shape(x), np.shape(y), np.shape(cos), np.shape(stretch)
+        )
+        dtype = np.result_type(x, y, cos, stretch)
+        out = np.empty(shape, dtype=dtype), np.empty(shape, dtype=dtype)
 
+    # NOTE: The y-buffer holds the second term of the x-coordinate first
+    xt, yt = out
+    np.multiply(y, -sin * stretch, out=yt)
+    np.multiply(x, cos * stretch, out=xt)
+    xt += yt
+    np.multiply(y, cos, out=yt)
+    yt += x * sin
     return xt, yt
+
+
+def transform_coordinates_jac(
+    x: float | np.ndarray,
+    y: float | np.ndarray,
+    cinc: float | None = None,
+    pa: float | None = None,
+    axis: str = "y",
+) -> Dict[str, Tuple[float | np.ndarray, float | np.ndarray]]:
+    """The derivatives of the transformed coordinates (see
+    transform_coordinates) with respect to the cosine of inclination
+    and the positional angle (in degree).
+
+    Returns
+    -------
+    jacobian : dict of tuple
+        The derivatives of the transformed x- and y-coordinate for
+        the "cinc" and "pa".
+    """
+    if pa is not None:
+        xr, yr = transform_coordinates(x, y, pa=pa)
+        dxr, dyr = -yr * np.pi / 180, xr * np.pi / 180
+    else:
+        xr, yr = x, y
+        dxr, dyr = np.zeros_like(x), np.zeros_like(y)
+
+    if cinc is None:
+        return {"cinc": (np.zeros_like(xr), np.zeros_like(yr)), "pa": (dxr, dyr)}
+
+    if axis == "x":
+        return {
+            "cinc": (-xr / cinc**2, np.zeros_like(yr)),
+            "pa": (dxr / cinc, dyr),
+        }
+    return {"cinc": (xr, np.zeros_like(yr)), "pa": (dxr * cinc, dyr)}
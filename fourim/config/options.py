@@ -12,8 +12,39 @@ from ..backend.utils import transform_coordinates
 
 
 def compute_fourier_grid(model: SimpleNamespace) -> Tuple[NDArray, NDArray]:
-    ucoord = np.linspace(0, 150, model.dim * 2)
-    return ucoord, np.hypot(*transform_coordinates(ucoord, ucoord))
+    """Computes the (1D) grid along the u = v diagonal.
+
+    The effective baselines are spaced linearly or logarithmically (starting
+    at the latest from a thousandth of the maximum) within the model's range.
+    """
+    baselines = model.baselines
+    if baselines.scale == "log":
+        minimum = max(baselines.min, baselines.max * 1e-3)
+        spf = np.geomspace(minimum, baselines.max, baselines.samples)
+    else:
+        spf = np.linspace(baselines.min, baselines.max, baselines.samples)
+
+    ucoord = spf / np.sqrt(2)
+    spf = np.hypot(*transform_coordinates(ucoord, ucoord))
+    for grid in [ucoord, spf]:
+        grid.setflags(write=False)
+    return ucoord, spf
+
+
+def compute_uv_grid(model: SimpleNamespace) -> Tuple[NDArray, NDArray]:
+    """Computes the upper half (v >= 0) of the uv-plane grid.
+
+    The lower half follows from the Hermitian symmetry of the visibility.
+    The dimension must be odd, so the grid contains v = 0.
+    """
+    if model.uu is not None and model.uv_dim == model.uu.shape[1]:
+        return model.uu, model.vv
+
+    if model.uv_dim % 2 == 0:
+        raise ValueError(f"The uv-plane's dimension ({model.uv_dim}) must be odd.")
+
+    ucoord = np.linspace(-model.uv_max, model.uv_max, model.uv_dim)
+    return np.meshgrid(ucoord, ucoord[model.uv_dim // 2 :])
 
 
 def compute_image_grid(model: SimpleNamespace) -> Tuple[NDArray, NDArray]:
@@ -27,12 +58,33 @@ def compute_image_grid(model: SimpleNamespace) -> Tuple[NDArray, NDArray]:
 
 files = {}
 display = SimpleNamespace(one_dimensional=True, amplitude="vis2", label=r"V^2 (a.u.)")
-settings = SimpleNamespace(display=display)
+uncertainty = SimpleNamespace(
+    enabled=False, samples=1000, batch_size=100, quantiles=[0.16, 0.84]
+)
+emulator = SimpleNamespace(
+    enabled=False,
+    frequencies=8192,
+    max_frequency=20,
+    tolerance={"uniform_disc": 1e-4, "Iring": 1e-4},
+)
+history = SimpleNamespace(max_entries=1000, memory_budget=2**28)
+comparison = SimpleNamespace(enabled=False, difference=False, reference=0)
+beam = SimpleNamespace(enabled=False, kind="gauss", fwhm=2.0, diameter=8.2)
+settings = SimpleNamespace(
+    display=display,
+    uncertainty=uncertainty,
+    emulator=emulator,
+    history=history,
+    comparison=comparison,
+    beam=beam,
+)
 
 with open(Path(__file__).parent.parent / "config" / "components.yaml", "r") as f:
     avail = yaml.safe_load(f)
 
-components = SimpleNamespace(avail=SimpleNamespace(**avail), current={}, init="point")
+components = SimpleNamespace(
+    avail=SimpleNamespace(**avail), current={}, pinned=[], init="point"
+)
 
 with open(Path(__file__).parent.parent / "config" / "parameters.toml", "r") as f:
     params = toml.load(f)
@@ -52,15 +104,33 @@ model = SimpleNamespace(
     dim=512,
     pixel_size=0.1,
     wl=3.2e-6,
+    baselines=SimpleNamespace(
+        min=0,
+        max=200,
+        samples=128,
+        scale="linear",
+        adaptive=True,
+        tolerance=1e-3,
+        max_samples=1024,
+    ),
     u=None,
     spf=None,
     max_im=None,
     xx=None,
     yy=None,
+    uv_dim=257,
+    uv_max=150,
+    uu=None,
+    vv=None,
     results={},
 )
 
 model.max_im = model.dim / 2 * model.pixel_size
 model.u, model.spf = compute_fourier_grid(model)
 model.xx, model.yy = compute_image_grid(model)
+model.uu, model.vv = compute_uv_grid(model)
+
+# NOTE: The grids are shared between the model snapshots and must not be changed
+for grid in [model.xx, model.yy, model.uu, model.vv]:
+    grid.setflags(write=False)
 OPTIONS = SimpleNamespace(model=model, settings=settings, files=files)
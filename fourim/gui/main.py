@@ -1,6 +1,7 @@
-from PySide6.QtGui import QIcon, QPixmap
+from PySide6.QtGui import QIcon, QKeySequence, QPixmap, QShortcut
 from PySide6.QtWidgets import QMainWindow, QTabWidget
 
+from ..config.options import OPTIONS
 from .plot import PlotTab
 from .settings import SettingsTab
 
@@ -37,3 +38,24 @@ class MainWindow(QMainWindow):
 
         self.tab_widget.addTab(self.plot_tab, "Graphs")
         self.tab_widget.addTab(self.settings_tab, "Settings")
+
+        QShortcut(QKeySequence.Undo, self, activated=self.undo)
+        QShortcut(QKeySequence.Redo, self, activated=self.redo)
+
+    def undo(self) -> None:
+        """Restores the previous model from the history."""
+        self.restore_model(self.plot_tab.history.undo())
+
+    def redo(self) -> None:
+        """Restores the next model from the history."""
+        self.restore_model(self.plot_tab.history.redo())
+
+    def restore_model(self, components: dict | None) -> None:
+        """Restores the model's components and displays their (cached) results."""
+        if components is None:
+            return
+
+        OPTIONS.model.components.current = components
+        self.settings_tab.update_model_list()
+        self.plot_tab.scroll_bar.update_scrollbar()
+        self.plot_tab.display_model()
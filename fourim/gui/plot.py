@@ -1,8 +1,11 @@
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
 
 import matplotlib
 import matplotlib.lines as mlines
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
 from numpy.typing import NDArray
@@ -11,8 +14,17 @@ matplotlib.use("Qt5Agg")
 
 from PySide6.QtWidgets import QGridLayout, QWidget
 
-from ..backend.compute import compute_complex_vis, compute_image
-from ..backend.utils import run_threaded
+from ..backend.compute import (
+    compute_adaptive_vis,
+    compute_complex_vis,
+    compute_image,
+    compute_uv_map,
+)
+from ..backend.decimate import DecimatedData
+from ..backend.history import History, snapshot_key
+from ..backend.snapshot import ModelSnapshot, take_snapshot
+from ..backend.uncertainty import compute_uncertainty_bands
+from ..backend.utils import get_model_label, run_threaded
 from ..config.options import OPTIONS
 from .scrollbar import ScrollBar
 
@@ -33,6 +45,11 @@ class MplCanvas(FigureCanvasQTAgg):
         The height of the plot.
     dpi : int
         The dots per inch of the plot.
+
+    Attributes
+    ----------
+    overplots : list of types.SimpleNamespace
+        The overplotted (decimated) data sets.
     """
 
     def __init__(
@@ -41,6 +58,8 @@ class MplCanvas(FigureCanvasQTAgg):
         """The class's initialiser."""
         fig = Figure(figsize=(width, height), dpi=dpi)
         self.axes = fig.add_subplot(111)
+        self.overplots, self.overplots_view = [], None
+        self.axes.callbacks.connect("xlim_changed", self.draw_overplots)
         super(MplCanvas, self).__init__(fig)
         self.show()
 
@@ -54,18 +73,29 @@ class MplCanvas(FigureCanvasQTAgg):
         vlims: Optional[List[float | None]] = [None, None],
         xlabel: Optional[str] = None,
         ylabel: Optional[str] = None,
+        origin: Optional[str] = None,
+        band: Optional[NDArray] = None,
+        xscale: Optional[str] = "linear",
+        label: Optional[str] = None,
     ) -> None:
         """Update the plot with the new model images."""
         self.axes.cla()
         if y is not None:
-            self.axes.plot(x, y)
+            self.axes.plot(x, y, label=label)
+            if band is not None:
+                self.axes.fill_between(x, *band, alpha=0.3, linewidth=0)
+            self.axes.set_xscale(xscale)
             self.axes.set_ylim(ylims)
             self.axes.set_xlabel(r"$B_{\mathrm{eff}}$ $\left(\mathrm{M}\lambda\right)$")
         else:
-            self.axes.imshow(x, extent=extent, vmin=vlims[0], vmax=vlims[1])
+            self.axes.imshow(
+                x, extent=extent, vmin=vlims[0], vmax=vlims[1], origin=origin
+            )
             self.axes.set_xlabel(xlabel)
         self.axes.set_ylabel(ylabel)
         self.axes.set_title(title)
+        if y is not None:
+            self.draw_overplots(cleared=True)
         self.draw()
 
     # TODO: Add Better color support
@@ -76,11 +106,71 @@ class MplCanvas(FigureCanvasQTAgg):
         yerr: Optional[NDArray] = None,
         label: Optional[str] = None,
     ) -> None:
-        """Overplot the data."""
-        if yerr is not None:
-            self.axes.errorbar(x, y, yerr, label=label, fmt="o")
-        else:
-            self.axes.scatter(x, y, label=label, marker="X")
+        """Overplot the data.
+
+        The data is decimated to the current view range and redrawn
+        (in more detail) when the view range changes.
+        """
+        self.overplots.append(
+            SimpleNamespace(data=DecimatedData(x, y, yerr), label=label, artist=None)
+        )
+        self.overplots_view = None
+        self.draw_overplots()
+        self.draw()
+
+    def remove_overplots(self) -> None:
+        """Removes all overplotted data."""
+        for overplot in self.overplots:
+            if overplot.artist is not None:
+                overplot.artist.remove()
+        self.overplots, self.overplots_view = [], None
+        self.axes.callbacks.connect("xlim_changed", self.draw_overplots)
+        self.draw()
+
+    def draw_overplots(self, *args, cleared: bool = False) -> None:
+        """Draws the overplotted data decimated to the current view range.
+
+        If the x-axis is autoscaled the full range of the data is shown.
+        """
+        if cleared:
+            self.overplots_view = None
+            for overplot in self.overplots:
+                overplot.artist = None
+            self.axes.callbacks.connect("xlim_changed", self.draw_overplots)
+
+        view = (-np.inf, np.inf)
+        if not self.axes.get_autoscalex_on():
+            view = self.axes.get_xlim()
+        if view == self.overplots_view:
+            return
+
+        self.overplots_view = view
+        for overplot in self.overplots:
+            if overplot.artist is not None:
+                overplot.artist.remove()
+
+            data, index = overplot.data, overplot.data.select(*view)
+            if data.yerr is not None:
+                overplot.artist = self.axes.errorbar(
+                    data.x[index],
+                    data.y[index],
+                    data.yerr[index],
+                    label=overplot.label,
+                    fmt="o",
+                )
+            else:
+                overplot.artist = self.axes.scatter(
+                    data.x[index], data.y[index], label=overplot.label, marker="X"
+                )
+        self.draw_idle()
+
+    def plot_models(
+        self, x: List[NDArray], y: List[NDArray], labels: List[str]
+    ) -> None:
+        """Plots the curves of further models over the current plot."""
+        for model_x, model_y, label in zip(x, y, labels):
+            self.axes.plot(model_x, model_y, linestyle="--", label=label)
+        self.axes.legend(handles=self.axes.get_lines(), fontsize="small")
         self.draw()
 
     def add_legend(self) -> None:
@@ -96,11 +186,16 @@ class MplCanvas(FigureCanvasQTAgg):
 
 
 # TODO: Move plot tab to its own file
-# TODO: Add support for different scalings of the 1D baseline axis
 # TODO: Add support to overplot the different VLTI and ALMA configurations
 # TODO: Add save and load functionalities to models
 class PlotTab(QWidget):
-    """The plot tab for the GUI."""
+    """The plot tab for the GUI.
+
+    Attributes
+    ----------
+    history : History
+        The undo/redo history of the model and its cached results.
+    """
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         """The class's initialiser."""
@@ -111,6 +206,10 @@ class PlotTab(QWidget):
         self.canvas_middle = MplCanvas(self, width=5, height=4)
         self.canvas_right = MplCanvas(self, width=5, height=4)
         self.scroll_bar = ScrollBar(self)
+        self.history = History(
+            OPTIONS.settings.history.max_entries,
+            OPTIONS.settings.history.memory_budget,
+        )
         layout.addWidget(self.canvas_left, 0, 0)
         layout.addWidget(self.canvas_middle, 0, 1)
         layout.addWidget(self.canvas_right, 0, 2)
@@ -122,48 +221,169 @@ class PlotTab(QWidget):
         self.setLayout(layout)
         self.display_model()
 
-    # TODO: Add legend at some point
-    def display_model(self):
-        """Displays the model in the plot."""
-        model = OPTIONS.model
-        vis_thread = run_threaded(
-            compute_complex_vis,
-            model.results,
-            "vis",
-            model.components.current,
-            model.u,
-            model.wl,
-        )
-        img_thread = run_threaded(
-            compute_image,
-            model.results,
-            "img",
-            model.components.current,
-            model.xx,
-            model.yy,
-        )
-        img_thread.join()
+    def evaluate(self, snapshot: ModelSnapshot) -> Dict:
+        """Computes the results of a snapshot."""
+        uncertainty = OPTIONS.settings.uncertainty
+        results, adaptive = {}, snapshot.baselines.adaptive
+        if not snapshot.one_dimensional:
+            vis_thread = run_threaded(compute_uv_map, results, "uv", snapshot)
+        elif adaptive:
+            vis_thread = run_threaded(
+                compute_adaptive_vis, results, "adaptive", snapshot
+            )
+        else:
+            vis_thread = run_threaded(compute_complex_vis, results, "vis", snapshot)
+        img_thread = run_threaded(compute_image, results, "img", snapshot)
         vis_thread.join()
 
+        if snapshot.one_dimensional and adaptive:
+            ucoord, spf, *results["vis"] = results.pop("adaptive")
+            snapshot = snapshot._replace(u=ucoord, spf=spf)
+
+        results["spf"], results["bands"] = snapshot.spf, (None, None)
+        if uncertainty.enabled and snapshot.one_dimensional:
+            run_threaded(
+                compute_uncertainty_bands,
+                results,
+                "bands",
+                snapshot,
+                uncertainty.quantiles,
+                uncertainty.samples,
+                uncertainty.batch_size,
+            ).join()
+        img_thread.join()
+        return results
+
+    def get_key(self, snapshot: ModelSnapshot) -> Tuple:
+        """Gets the key of a snapshot's results in the history's cache."""
+        uncertainty = OPTIONS.settings.uncertainty
+        return snapshot_key(
+            snapshot,
+            uncertainty.enabled,
+            uncertainty.samples,
+            tuple(uncertainty.quantiles),
+        )
+
+    def compute_results(
+        self, snapshots: List[ModelSnapshot], transient: bool = False
+    ) -> List[Dict]:
+        """Computes the results of the snapshots concurrently.
+
+        Results of unchanged snapshots are looked up in the history's cache
+        instead of being recomputed. If transient, the results of the first
+        snapshot are not cached (e.g., while a slider is dragged).
+        """
+        keys = list(map(self.get_key, snapshots))
+        results = {key: self.history.lookup(key) for key in keys}
+        pending = {
+            key: snapshot
+            for key, snapshot in zip(keys, snapshots)
+            if results[key] is None
+        }
+        if pending:
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                for key, result in zip(
+                    pending, executor.map(self.evaluate, pending.values())
+                ):
+                    results[key] = result
+                    if not (transient and key == keys[0]):
+                        self.history.cache(key, result)
+        return [results[key] for key in keys]
+
+    def record_model(self) -> None:
+        """Records the current model in the history and caches its
+        (displayed) results."""
+        self.history.cache(self.get_key(take_snapshot()), OPTIONS.model.results)
+        self.history.record(OPTIONS.model.components.current.values())
+
+    # TODO: Add legend at some point
+    def display_model(self, record: bool = True):
+        """Displays the model (and the pinned models it is compared to)
+        in the plot.
+
+        Parameters
+        ----------
+        record : bool, optional
+            If the model is recorded in the history. Intermediate states
+            (e.g., while a slider is dragged) are not recorded.
+        """
+        model, comparison = OPTIONS.model, OPTIONS.settings.comparison
+        snapshots = [take_snapshot()]
+        if comparison.enabled:
+            snapshots.extend(map(take_snapshot, model.components.pinned))
+
+        model.results, *pinned = self.compute_results(snapshots, not record)
+        if record:
+            self.history.record(model.components.current.values())
+        labels = [get_model_label(snapshot.components) for snapshot in snapshots]
+
+        snapshot, max_im = snapshots[0], snapshots[0].max_im
+        # NOTE: The convolution spreads the flux, so the beam's peak is not one
+        vlims = [0, 1] if snapshot.beam is None else [0, None]
+        image, title = model.results["img"], "Model Image"
+        if comparison.difference and pinned:
+            reference = min(comparison.reference, len(pinned) - 1)
+            image = image - pinned[reference]["img"]
+            title, vlims = f"Difference to {labels[reference + 1]}", [-1, 1]
+
         self.canvas_left.update_plot(
-            model.results["img"],
-            title="Model Image",
-            vlims=[0, 1],
-            extent=[-model.max_im, model.max_im, -model.max_im, model.max_im],
+            image,
+            title=title,
+            vlims=vlims,
+            extent=[-max_im, max_im, -max_im, max_im],
             xlabel=r"$\alpha$ (mas)",
             ylabel=r"$\delta$ (mas)",
         )
+        if not snapshot.one_dimensional:
+            self.display_uv_map(snapshot)
+            return
+
         self.canvas_middle.update_plot(
-            model.spf,
+            model.results["spf"],
             model.results["vis"][0],
             ylims=[-0.1, 1.1],
             ylabel=OPTIONS.settings.display.label,
             title=r"Amplitudes",
+            band=model.results["bands"][0],
+            xscale=snapshot.baselines.scale,
+            label=labels[0],
         )
         self.canvas_right.update_plot(
-            model.spf,
+            model.results["spf"],
             model.results["vis"][1],
             ylims=[-185, 185],
             ylabel=r"$\phi$ ($^\circ$)",
             title="Phases",
+            band=model.results["bands"][1],
+            xscale=snapshot.baselines.scale,
+            label=labels[0],
+        )
+        if pinned:
+            spfs = [results["spf"] for results in pinned]
+            for index, canvas in enumerate([self.canvas_middle, self.canvas_right]):
+                canvas.plot_models(
+                    spfs, [results["vis"][index] for results in pinned], labels[1:]
+                )
+
+    def display_uv_map(self, snapshot: ModelSnapshot):
+        """Displays the amplitude and phase maps of the uv-plane."""
+        uv_max = snapshot.uv_max
+        extent = [-uv_max, uv_max, -uv_max, uv_max]
+        self.canvas_middle.update_plot(
+            OPTIONS.model.results["uv"][0],
+            title=f"Amplitudes ({OPTIONS.settings.display.label})",
+            vlims=[0, 1],
+            extent=extent,
+            xlabel=r"$u$ (m)",
+            ylabel=r"$v$ (m)",
+            origin="lower",
+        )
+        self.canvas_right.update_plot(
+            OPTIONS.model.results["uv"][1],
+            title=r"Phases ($^\circ$)",
+            vlims=[-180, 180],
+            extent=extent,
+            xlabel=r"$u$ (m)",
+            ylabel=r"$v$ (m)",
+            origin="lower",
         )
@@ -114,6 +114,7 @@ class ScrollBar(QWidget):
 
                 slider.slider.setFixedWidth(200)
                 slider.lineEdit.setFixedWidth(80)
+                slider.sigmaEdit.setFixedWidth(50)
 
                 self.sliders_grid.addWidget(slider, row, col)
                 col += 1
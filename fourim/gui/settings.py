@@ -2,10 +2,13 @@
 from typing import Optional
 
 from PySide6.QtWidgets import (
+    QButtonGroup,
+    QCheckBox,
     QComboBox,
     # QFileDialog,
     QHBoxLayout,
     QLabel,
+    QLineEdit,
     QListWidget,
     # QListWidgetItem,
     QPushButton,
@@ -15,7 +18,10 @@ from PySide6.QtWidgets import (
 )
 
 from ..backend.components import make_component
-from ..config.options import OPTIONS
+from ..backend.convolve import get_beam_fwhm
+from ..backend.history import decode_components, encode_components
+from ..backend.utils import get_model_label
+from ..config.options import OPTIONS, compute_fourier_grid
 
 
 # TODO: Add setting to choose between x, y and x and sep
@@ -47,6 +53,61 @@ class SettingsTab(QWidget):
         layout.addWidget(title_model_output)
         layout.addLayout(hLayout_model_output)
 
+        title_fourier_view = QLabel("Fourier view:")
+        hLayout_fourier_view = QHBoxLayout()
+
+        self.one_dimensional_radio = QRadioButton("1D cut")
+        self.one_dimensional_radio.setChecked(OPTIONS.settings.display.one_dimensional)
+        self.one_dimensional_radio.toggled.connect(self.toggle_fourier_view)
+        hLayout_fourier_view.addWidget(self.one_dimensional_radio)
+
+        self.two_dimensional_radio = QRadioButton("2D uv-plane")
+        self.two_dimensional_radio.setChecked(
+            not OPTIONS.settings.display.one_dimensional
+        )
+        hLayout_fourier_view.addWidget(self.two_dimensional_radio)
+
+        self.fourier_view_group = QButtonGroup(self)
+        self.fourier_view_group.addButton(self.one_dimensional_radio)
+        self.fourier_view_group.addButton(self.two_dimensional_radio)
+
+        self.uncertainty_checkbox = QCheckBox("Show uncertainty bands")
+        self.uncertainty_checkbox.setToolTip(
+            "Monte Carlo bands from the parameters' uncertainties (±)."
+        )
+        self.uncertainty_checkbox.setChecked(OPTIONS.settings.uncertainty.enabled)
+        self.uncertainty_checkbox.toggled.connect(self.toggle_uncertainty)
+        layout.addWidget(self.uncertainty_checkbox)
+
+        baselines = OPTIONS.model.baselines
+        title_baselines = QLabel("Baselines (m):")
+        hLayout_baselines = QHBoxLayout()
+        self.baseline_min = QLineEdit(f"{baselines.min}")
+        self.baseline_max = QLineEdit(f"{baselines.max}")
+        self.baseline_samples = QLineEdit(f"{baselines.samples}")
+        self.baseline_scale = QComboBox()
+        self.baseline_scale.addItems(["linear", "log"])
+        self.baseline_scale.setCurrentText(baselines.scale)
+        self.adaptive_checkbox = QCheckBox("Adaptive")
+        self.adaptive_checkbox.setChecked(baselines.adaptive)
+
+        for label, widget in [
+            ("Min:", self.baseline_min),
+            ("Max:", self.baseline_max),
+            ("Samples:", self.baseline_samples),
+        ]:
+            widget.editingFinished.connect(self.update_baselines)
+            hLayout_baselines.addWidget(QLabel(label))
+            hLayout_baselines.addWidget(widget)
+        self.baseline_scale.currentTextChanged.connect(self.update_baselines)
+        self.adaptive_checkbox.toggled.connect(self.update_baselines)
+        hLayout_baselines.addWidget(self.baseline_scale)
+        hLayout_baselines.addWidget(self.adaptive_checkbox)
+        layout.addWidget(title_baselines)
+        layout.addLayout(hLayout_baselines)
+        layout.addWidget(title_fourier_view)
+        layout.addLayout(hLayout_fourier_view)
+
         # TODO: Move this to the main tab (as a openable dialog)
         label_model = QLabel("Model:")
         self.model_combo = QComboBox()
@@ -71,6 +132,72 @@ class SettingsTab(QWidget):
         self.add_button.clicked.connect(self.add_model)
         self.remove_button.clicked.connect(self.remove_model)
 
+        comparison = OPTIONS.settings.comparison
+        title_comparison = QLabel("Comparison:")
+        self.compare_checkbox = QCheckBox("Compare pinned models")
+        self.compare_checkbox.setChecked(comparison.enabled)
+        self.compare_checkbox.toggled.connect(self.toggle_comparison)
+        self.difference_checkbox = QCheckBox("Show difference image")
+        self.difference_checkbox.setToolTip(
+            "The difference of the model image to the selected pinned model's."
+        )
+        self.difference_checkbox.setChecked(comparison.difference)
+        self.difference_checkbox.toggled.connect(self.toggle_comparison)
+        hLayout_comparison = QHBoxLayout()
+        hLayout_comparison.addWidget(self.compare_checkbox)
+        hLayout_comparison.addWidget(self.difference_checkbox)
+
+        self.pin_button = QPushButton("Pin")
+        self.pin_button.setToolTip("Pins a copy of the current model.")
+        self.edit_button = QPushButton("Edit")
+        self.edit_button.setToolTip("Swaps the selected pinned and current model.")
+        self.unpin_button = QPushButton("Unpin")
+        self.pin_button.clicked.connect(self.pin_model)
+        self.edit_button.clicked.connect(self.edit_pinned_model)
+        self.unpin_button.clicked.connect(self.unpin_model)
+        pin_layout = QHBoxLayout()
+        pin_layout.addWidget(self.pin_button)
+        pin_layout.addWidget(self.edit_button)
+        pin_layout.addWidget(self.unpin_button)
+
+        self.pinned_list = QListWidget()
+        self.pinned_list.currentRowChanged.connect(self.select_reference)
+        layout.addWidget(title_comparison)
+        layout.addLayout(hLayout_comparison)
+        layout.addLayout(pin_layout)
+        layout.addWidget(self.pinned_list)
+
+        beam = OPTIONS.settings.beam
+        title_beam = QLabel("Beam:")
+        hLayout_beam = QHBoxLayout()
+        self.beam_checkbox = QCheckBox("Convolve")
+        self.beam_checkbox.setToolTip(
+            "Convolves the model image with a gaussian (restoring) beam or "
+            "the airy pattern of a telescope."
+        )
+        self.beam_checkbox.setChecked(beam.enabled)
+        self.beam_kind = QComboBox()
+        self.beam_kind.addItems(["gauss", "airy"])
+        self.beam_kind.setCurrentText(beam.kind)
+        self.beam_fwhm = QLineEdit(f"{beam.fwhm}")
+        self.beam_diameter = QLineEdit(f"{beam.diameter}")
+        self.beam_status = QLabel()
+
+        self.beam_checkbox.toggled.connect(self.update_beam)
+        self.beam_kind.currentTextChanged.connect(self.update_beam)
+        hLayout_beam.addWidget(self.beam_checkbox)
+        hLayout_beam.addWidget(self.beam_kind)
+        for label, widget in [
+            ("FWHM (mas):", self.beam_fwhm),
+            ("Diameter (m):", self.beam_diameter),
+        ]:
+            widget.editingFinished.connect(self.update_beam)
+            hLayout_beam.addWidget(QLabel(label))
+            hLayout_beam.addWidget(widget)
+        hLayout_beam.addWidget(self.beam_status)
+        layout.addWidget(title_beam)
+        layout.addLayout(hLayout_beam)
+
         # TODO: Reimplement the overplotting of files
         # title_file = QLabel("Data Files:")
         # self.open_file_button = QPushButton("Open (.fits)-file")
@@ -106,6 +233,72 @@ class SettingsTab(QWidget):
         self.plots.scroll_bar.update_scrollbar()
         self.plots.display_model()
 
+    def update_model_list(self) -> None:
+        """Updates the model list from the current model's components."""
+        self.model_list.clear()
+        for component in OPTIONS.model.components.current.values():
+            self.model_list.addItem(component.name)
+
+    def update_pinned_list(self) -> None:
+        """Updates the list of the pinned models."""
+        self.pinned_list.blockSignals(True)
+        self.pinned_list.clear()
+        for components in OPTIONS.model.components.pinned:
+            self.pinned_list.addItem(get_model_label(components.values()))
+        self.pinned_list.setCurrentRow(OPTIONS.settings.comparison.reference)
+        self.pinned_list.blockSignals(False)
+
+    def pin_model(self) -> None:
+        """Pins a copy of the current model to compare against."""
+        components = OPTIONS.model.components
+        components.pinned.append(
+            decode_components(*encode_components(components.current.values()))
+        )
+        self.update_pinned_list()
+        if OPTIONS.settings.comparison.enabled:
+            self.plots.display_model()
+
+    def edit_pinned_model(self) -> None:
+        """Swaps the selected pinned model with the current one to edit it."""
+        components, row = OPTIONS.model.components, self.pinned_list.currentRow()
+        if row < 0:
+            return
+
+        components.current, components.pinned[row] = (
+            components.pinned[row],
+            components.current,
+        )
+        self.update_pinned_list()
+        self.update_model_list()
+        self.plots.scroll_bar.update_scrollbar()
+        self.plots.display_model()
+
+    def unpin_model(self) -> None:
+        """Removes the selected pinned model."""
+        row = self.pinned_list.currentRow()
+        if row < 0:
+            return
+
+        del OPTIONS.model.components.pinned[row]
+        OPTIONS.settings.comparison.reference = max(row - 1, 0)
+        self.update_pinned_list()
+        if OPTIONS.settings.comparison.enabled:
+            self.plots.display_model()
+
+    def select_reference(self, row: int) -> None:
+        """Slot for the pinned model selected as the difference's reference."""
+        comparison = OPTIONS.settings.comparison
+        comparison.reference = max(row, 0)
+        if comparison.enabled and comparison.difference:
+            self.plots.display_model()
+
+    def toggle_comparison(self) -> None:
+        """Slot for the comparison checkboxes toggled."""
+        comparison = OPTIONS.settings.comparison
+        comparison.enabled = self.compare_checkbox.isChecked()
+        comparison.difference = self.difference_checkbox.isChecked()
+        self.plots.display_model()
+
     def toggle_amplitude(self) -> None:
         """Slot for radio buttons toggled."""
         if self.vis_radio.isChecked():
@@ -116,6 +309,65 @@ class SettingsTab(QWidget):
             OPTIONS.settings.display.label = r"$V^2$ (a.u.)"
         self.plots.display_model()
 
+    def toggle_fourier_view(self) -> None:
+        """Slot for radio buttons toggled."""
+        OPTIONS.settings.display.one_dimensional = (
+            self.one_dimensional_radio.isChecked()
+        )
+        self.plots.display_model()
+
+    def toggle_uncertainty(self) -> None:
+        """Slot for the uncertainty checkbox toggled."""
+        OPTIONS.settings.uncertainty.enabled = self.uncertainty_checkbox.isChecked()
+        self.plots.display_model()
+
+    def update_baselines(self) -> None:
+        """Updates the baseline grid from the inputs."""
+        baselines = OPTIONS.model.baselines
+        try:
+            minimum = float(self.baseline_min.text())
+            maximum = float(self.baseline_max.text())
+            samples = int(self.baseline_samples.text())
+        except ValueError:
+            minimum, maximum, samples = -1, 0, 0
+
+        if minimum < 0 or maximum <= minimum or samples < 3:
+            self.baseline_min.setText(f"{baselines.min}")
+            self.baseline_max.setText(f"{baselines.max}")
+            self.baseline_samples.setText(f"{baselines.samples}")
+            return
+
+        baselines.min, baselines.max, baselines.samples = minimum, maximum, samples
+        baselines.scale = self.baseline_scale.currentText()
+        baselines.adaptive = self.adaptive_checkbox.isChecked()
+        OPTIONS.model.u, OPTIONS.model.spf = compute_fourier_grid(OPTIONS.model)
+        self.plots.display_model()
+
+    def update_beam(self) -> None:
+        """Updates the beam the image is convolved with from the inputs."""
+        beam = OPTIONS.settings.beam
+        try:
+            fwhm = float(self.beam_fwhm.text())
+            diameter = float(self.beam_diameter.text())
+        except ValueError:
+            fwhm, diameter = 0, 0
+
+        if fwhm <= 0 or diameter <= 0:
+            self.beam_fwhm.setText(f"{beam.fwhm}")
+            self.beam_diameter.setText(f"{beam.diameter}")
+            return
+
+        beam.fwhm, beam.diameter = fwhm, diameter
+        beam.kind = self.beam_kind.currentText()
+        beam.enabled = self.beam_checkbox.isChecked()
+
+        field = 2 * OPTIONS.model.max_im
+        self.beam_status.clear()
+        if beam.enabled and get_beam_fwhm(beam, OPTIONS.model.wl) > field:
+            self.beam_status.setText(f"Beam larger than the image ({field:.1f} mas)!")
+            beam.enabled = False
+        self.plots.display_model()
+
     # TODO: Reimplement this
     # def toggle_coplanar(self) -> None:
     #     """Slot for radio buttons toggled."""
@@ -43,6 +43,10 @@ class SliderWithInput(QWidget):
         The slider.
     lineEdit : QLineEdit
         The input field.
+    sigmaLabel : QLabel
+        The label of the parameter's uncertainty.
+    sigmaEdit : QLineEdit
+        The input field for the parameter's uncertainty.
     """
 
     def __init__(
@@ -63,6 +67,13 @@ class SliderWithInput(QWidget):
         self.unit = QLabel(str(param.unit))
         label_layout.addWidget(QLabel(param.name))
         label_layout.addWidget(self.unit)
+        self.sigmaEdit = QLineEdit(f"{getattr(param, 'sigma', 0):.2f}")
+        self.sigmaEdit.setToolTip("The parameter's uncertainty (1 sigma).")
+        self.sigmaEdit.returnPressed.connect(self.updateSigma)
+        self.sigmaLabel = QLabel("±")
+        for widget in [self.sigmaLabel, self.sigmaEdit]:
+            widget.setVisible(index is not None)
+            label_layout.addWidget(widget)
         main_layout.addLayout(label_layout)
 
         slider_layout = QHBoxLayout()
@@ -73,6 +84,8 @@ class SliderWithInput(QWidget):
         self.slider.valueChanged.connect(
             self.updateLineEdit if update_function is None else update_function
         )
+        if update_function is None:
+            self.slider.sliderReleased.connect(self.parent.parent.record_model)
 
         self.lineEdit = QLineEdit(f"{param.value:.2f}")
         self.lineEdit.returnPressed.connect(self.updateSliderFromLineEdit)
@@ -91,6 +104,15 @@ class SliderWithInput(QWidget):
                 value / self.scaling
             )
 
+        # NOTE: Only the released value of a dragged slider is recorded
+        self.parent.parent.display_model(record=not self.slider.isSliderDown())
+
+    def updateSigma(self):
+        """Updates the parameter's uncertainty with the new value."""
+        value = abs(round(float(self.sigmaEdit.text()), 2))
+        self.sigmaEdit.setText(f"{value:.2f}")
+        components = OPTIONS.model.components.current
+        getattr(components[self.index].params, self.name).sigma = value
         self.parent.parent.display_model()
 
     def updateSliderFromLineEdit(self):
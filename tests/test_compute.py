@@ -0,0 +1,121 @@
+import astropy.units as u
+import numpy as np
+import pytest
+
+from fourim.backend import compute
+from fourim.backend.components import make_component
+from fourim.backend.compute import compute_complex_vis, compute_image
+from fourim.backend.snapshot import take_snapshot
+from fourim.backend.utils import get_param_value, transform_coordinates
+
+NAMES = ["gauss", "gauss", "gauss", "point", "lorentz", "uniform_disc", "Iring"]
+WL = 3.2e-6
+
+
+def make_snapshot(names=NAMES):
+    """Makes a snapshot of a model with several components of the same type,
+    each with a different orientation and offset."""
+    components = {}
+    for index, name in enumerate(names):
+        components[index] = make_component(name)
+        values = {
+            "x": index - 3,
+            "y": 2 - index,
+            "fr": 0.3 + 0.1 * index,
+            "cinc": 0.5 + 0.07 * index,
+            "pa": 25 * index,
+            "fwhm": 2 + index,
+        }
+        for param, value in values.items():
+            if hasattr(components[index].params, param):
+                getattr(components[index].params, param).value = value
+    return take_snapshot(components)
+
+
+def get_orientation(component):
+    """Gets the cosine of inclination and positional angle of a component (the
+    point source and background are never oriented)."""
+    if component.name in ["point", "background"]:
+        return None, None
+    return component.params.cinc.value, component.params.pa.value
+
+
+def reference_vis(snapshot, ucoord, vcoord):
+    """The complex visibility computed component by component. The translation
+    is applied on the untransformed uv-coordinates."""
+    ucoord, vcoord = ucoord / WL, vcoord / WL
+    fluxes = [component.params.fr.value for component in snapshot.components]
+    complex_vis = 0
+    for component, flux in zip(snapshot.components, fluxes):
+        cinc, pa = get_orientation(component)
+        utb, vtb = transform_coordinates(ucoord, vcoord, cinc, pa)
+        vis = component.vis(np.hypot(utb, vtb), np.arctan2(utb, vtb), component.params)
+        if np.count_nonzero(fluxes) > 1:
+            x = get_param_value(component.params.x).to(u.rad).value
+            y = get_param_value(component.params.y).to(u.rad).value
+            vis = vis * np.exp(-2j * np.pi * (x * ucoord + y * vcoord))
+        complex_vis += flux * vis
+    return complex_vis / sum(fluxes)
+
+
+def reference_image(snapshot, xx, yy):
+    """The image computed component by component."""
+    image = 0
+    for component in snapshot.components:
+        params, (cinc, pa) = component.params, get_orientation(component)
+        xs, ys = xx - params.x.value, yy - params.y.value
+        xt, yt = transform_coordinates(xs, ys, cinc, pa, axis="x")
+        img = component.img(np.hypot(xt, yt), np.arctan2(xt, yt), params)
+        image += params.fr.value * img / img.max()
+    return image
+
+
+@pytest.fixture
+def small_chunks(monkeypatch) -> None:
+    """Splits the groups into chunks of two components and several tiles."""
+    monkeypatch.setattr(compute, "MAX_CHUNK_SIZE", 2 * 300)
+    monkeypatch.setattr(compute, "MAX_IMAGE_CHUNK_SIZE", 2 * 64**2)
+    monkeypatch.setattr(compute, "MAX_TILE_SIZE", 2 * 10 * 64)
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_vis_matches_component_loop(request, chunked: bool) -> None:
+    """Tests the grouped evaluation against a loop over the components."""
+    if chunked:
+        request.getfixturevalue("small_chunks")
+    snapshot = make_snapshot()
+    ucoord, vcoord = np.linspace(-120, 150, 300), np.linspace(80, -60, 300)
+    vis, phase = compute_complex_vis(snapshot, ucoord, WL, vcoord)
+
+    expected = reference_vis(snapshot, ucoord, vcoord)
+    assert np.allclose(vis, np.abs(expected) ** 2, atol=1e-12)
+    assert np.allclose(phase, np.angle(expected, deg=True), atol=1e-8)
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_image_matches_component_loop(request, chunked: bool) -> None:
+    """Tests the grouped (and tiled) evaluation against a loop over the
+    components (the thin ring falls between the pixels of a small image)."""
+    if chunked:
+        request.getfixturevalue("small_chunks")
+    snapshot = make_snapshot(NAMES[:-1])
+    xx, yy = np.meshgrid(np.linspace(-20, 20, 64), np.linspace(-20, 20, 64))
+    image = compute_image(snapshot._replace(beam=None), xx, yy)
+    assert np.allclose(image, reference_image(snapshot, xx, yy), atol=1e-12)
+
+
+def test_translation_is_not_transformed() -> None:
+    """Tests that an inclined and rotated component is translated by its
+    offset on the untransformed uv-coordinates."""
+    snapshot = make_snapshot(["gauss", "point"])
+    ucoord, vcoord = np.linspace(-120, 150, 300), np.linspace(80, -60, 300)
+    _, phase = compute_complex_vis(snapshot, ucoord, WL, vcoord)
+    expected = reference_vis(snapshot, ucoord, vcoord)
+    assert np.allclose(phase, np.angle(expected, deg=True), atol=1e-8)
+
+
+def test_single_component_is_not_translated() -> None:
+    """Tests that the offset of a single component does not change its phase."""
+    snapshot = make_snapshot(["gauss"])
+    _, phase = compute_complex_vis(snapshot, np.linspace(-120, 150, 300), WL)
+    assert np.allclose(phase, 0)
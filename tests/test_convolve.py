@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from fourim.backend.convolve import convolve_image
+
+DIM, PIXEL_SIZE, WL = 512, 0.1, 3.2e-6
+
+
+def make_point(x: float) -> np.ndarray:
+    """Makes an image of a point source at an offset x (in mas)."""
+    image = np.zeros((DIM, DIM))
+    image[DIM // 2, DIM // 2 + int(round(x / PIXEL_SIZE))] = 1
+    return image
+
+
+def test_gaussian_beam() -> None:
+    """Tests that a point source is convolved to the gaussian beam."""
+    beam = SimpleNamespace(kind="gauss", fwhm=2.0, diameter=8.2)
+    convolved = convolve_image(make_point(0), PIXEL_SIZE, beam, WL)
+
+    x = (np.arange(DIM) - DIM // 2) * PIXEL_SIZE
+    sigma = beam.fwhm / (2 * np.sqrt(2 * np.log(2)))
+    expected = np.exp(-(x[:, None] ** 2 + x**2) / (2 * sigma**2))
+    assert np.allclose(convolved, expected / expected.sum(), atol=1e-12)
+
+
+def test_no_wrap_around() -> None:
+    """Tests that the flux of a source at the edge does not wrap around."""
+    beam = SimpleNamespace(kind="gauss", fwhm=4.0, diameter=8.2)
+    convolved = convolve_image(make_point(24), PIXEL_SIZE, beam, WL)
+    assert np.abs(convolved[:, : DIM // 2]).sum() < 1e-12
+
+
+def test_beam_larger_than_image() -> None:
+    """Tests that a beam larger than the image is refused."""
+    beam = SimpleNamespace(kind="airy", fwhm=2.0, diameter=8.2)
+    with pytest.raises(ValueError):
+        convolve_image(make_point(0), PIXEL_SIZE, beam, WL)
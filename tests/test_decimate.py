@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from fourim.backend.decimate import METHODS, DecimatedData
+
+RNG = np.random.default_rng(0)
+X = np.sort(RNG.uniform(0, 100, 20000))
+Y = np.sin(X) + RNG.normal(scale=0.1, size=X.size)
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("n_out", [4, 7, 100, 1999, 19999])
+def test_decimation_indices(method: str, n_out: int) -> None:
+    """Tests that the first and last point are kept and that the indices
+    are sorted and unique."""
+    indices = METHODS[method](X, Y, n_out)
+    assert indices[0] == 0 and indices[-1] == X.size - 1
+    assert np.all(np.diff(indices) > 0)
+    assert indices.size <= n_out
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_decimation_keeps_small_data(method: str) -> None:
+    """Tests that data with fewer points than requested is kept."""
+    assert np.array_equal(METHODS[method](X[:50], Y[:50], 100), np.arange(50))
+
+
+def test_minmax_keeps_extrema() -> None:
+    """Tests that the global extrema are kept."""
+    indices = METHODS["minmax"](X, Y, 100)
+    assert np.argmin(Y) in indices and np.argmax(Y) in indices
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize(
+    "xmin, xmax", [(-np.inf, np.inf), (-10, 50), (10, 90), (42, 47), (60, 61)]
+)
+def test_select_in_view(method: str, xmin: float, xmax: float) -> None:
+    """Tests that the selected indices are sorted, unique, within the view
+    and (at least) the target number of points if the view has as many."""
+    data = DecimatedData(X, Y, target=500, method=method)
+    indices = data.select(xmin, xmax)
+    in_view = np.count_nonzero((X >= xmin) & (X <= xmax))
+
+    assert np.all(np.diff(indices) > 0)
+    assert np.all((data.x[indices] >= xmin) & (data.x[indices] <= xmax))
+    if in_view <= data.target:
+        assert np.array_equal(indices, np.flatnonzero((X >= xmin) & (X <= xmax)))
+    else:
+        assert indices.size >= data.target // 2
+
+
+def test_select_full_view_keeps_ends() -> None:
+    """Tests that the full view keeps the first and last point."""
+    indices = DecimatedData(X, Y, target=500).select()
+    assert indices[0] == 0 and indices[-1] == X.size - 1
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_select_zoomed_in_returns_all(method: str) -> None:
+    """Tests that zooming in to fewer points than the target returns every
+    point in the view."""
+    data = DecimatedData(X, Y, target=500, method=method)
+    xmin, xmax = X[1000], X[1300]
+    assert np.array_equal(data.select(xmin, xmax), np.arange(1000, 1301))
+
+
+def test_unsorted_data_is_sorted() -> None:
+    """Tests that unsorted data is sorted by its x-values."""
+    order = RNG.permutation(X.size)
+    data = DecimatedData(X[order], Y[order], target=500)
+    assert np.array_equal(data.x, X) and np.array_equal(data.y, Y)
@@ -0,0 +1,31 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from fourim.backend.components import make_component
+from fourim.backend.compute import compute_complex_vis
+from fourim.backend.snapshot import take_snapshot
+
+SETTINGS = SimpleNamespace(
+    enabled=True,
+    frequencies=8192,
+    max_frequency=20,
+    tolerance={"uniform_disc": 1e-4, "Iring": 1e-4},
+)
+
+
+@pytest.mark.parametrize("name, param", [("uniform_disc", "diam"), ("Iring", "rin")])
+@pytest.mark.parametrize("size", [0.5, 4, 20])
+def test_emulator_matches_kernel(name: str, param: str, size: float) -> None:
+    """Tests that the emulated visibilities are within the tolerance."""
+    component = make_component(name)
+    getattr(component.params, param).value = size
+    snapshot = take_snapshot({0: component})
+    ucoord = np.linspace(0, 200, 1000)
+
+    exact, _ = compute_complex_vis(snapshot, ucoord, 3.2e-6)
+    emulated, _ = compute_complex_vis(
+        snapshot._replace(emulator=SETTINGS), ucoord, 3.2e-6
+    )
+    assert np.abs(emulated - exact).max() <= SETTINGS.tolerance[name]
@@ -0,0 +1,96 @@
+import numpy as np
+
+from fourim.backend.components import make_component
+from fourim.backend.history import History, get_nbytes
+
+
+def make_components(fwhm: float):
+    """Makes the components of a gaussian with a full width at half maximum."""
+    component = make_component("gauss")
+    component.params.fwhm.value = fwhm
+    return {0: component}
+
+
+def get_fwhm(components) -> float:
+    """Gets the full width at half maximum of the decoded components."""
+    return components[0].params.fwhm.value
+
+
+def test_record_skips_duplicates() -> None:
+    """Tests that recording the current state again does not add an entry."""
+    history = History()
+    for fwhm in [1, 1, 2, 2, 2]:
+        history.record(make_components(fwhm).values())
+    assert len(history.entries) == 2 and history.position == 1
+
+
+def test_record_discards_redo_branch() -> None:
+    """Tests that recording after undoing discards the undone states."""
+    history = History()
+    for fwhm in [1, 2, 3]:
+        history.record(make_components(fwhm).values())
+    history.undo()
+    history.undo()
+    history.record(make_components(4).values())
+
+    assert len(history.entries) == 2 and history.position == 1
+    assert history.redo() is None
+    assert get_fwhm(history.undo()) == 1
+
+
+def test_undo_redo_stop_at_ends() -> None:
+    """Tests that undo and redo step through the states and stop at both ends."""
+    history = History()
+    assert history.undo() is None and history.redo() is None
+    for fwhm in [1, 2, 3]:
+        history.record(make_components(fwhm).values())
+
+    assert history.redo() is None
+    assert [get_fwhm(history.undo()) for _ in range(2)] == [2, 1]
+    assert history.undo() is None and history.position == 0
+    assert [get_fwhm(history.redo()) for _ in range(2)] == [2, 3]
+    assert history.redo() is None and history.position == 2
+
+
+def test_max_entries_trims_oldest() -> None:
+    """Tests that the oldest states are dropped above the maximum entries."""
+    history = History(max_entries=3)
+    for fwhm in range(1, 6):
+        history.record(make_components(fwhm).values())
+
+    assert len(history.entries) == 3 and history.position == 2
+    assert [get_fwhm(history.undo()) for _ in range(2)] == [4, 3]
+    assert history.undo() is None
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    """Tests that the least recently used results are evicted above the
+    memory budget and that looking up results marks them as used."""
+    results = {"vis": np.zeros(100), "phase": [np.zeros(100)]}
+    assert get_nbytes(results) == 1600
+
+    history = History(memory_budget=3 * 1600)
+    for key in "abc":
+        history.cache(key, results)
+    assert history.lookup("a") is results
+    history.cache("d", results)
+
+    assert list(history.results) == ["c", "a", "d"]
+    assert history.lookup("b") is None
+    assert history.nbytes == 3 * 1600
+
+
+def test_cache_replaces_key() -> None:
+    """Tests that caching a key again replaces its results and memory."""
+    history = History(memory_budget=1000)
+    history.cache("a", np.zeros(100))
+    history.cache("a", np.zeros(10))
+    assert len(history.results) == 1 and history.nbytes == 80
+
+
+def test_cache_keeps_newest_above_budget() -> None:
+    """Tests that results larger than the budget are still cached alone."""
+    history = History(memory_budget=100)
+    history.cache("a", np.zeros(10))
+    history.cache("b", np.zeros(100))
+    assert list(history.results) == ["b"] and history.nbytes == 800
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from fourim.backend.components import make_component
+from fourim.backend.compute import compute_complex_vis_and_jacobian
+from fourim.backend.snapshot import FrozenNamespace, take_snapshot
+
+VALUES = {
+    "x": 1.5,
+    "y": -2,
+    "fr": 0.8,
+    "cinc": 0.7,
+    "pa": 40,
+    "fwhm": 3,
+    "hlr": 2,
+    "diam": 6,
+    "rin": 4,
+}
+
+
+def make_snapshot(name: str):
+    """Makes a snapshot of a component and an offset gaussian (so that the
+    translation is part of the model)."""
+    components = {0: make_component(name), 1: make_component("gauss")}
+    for param, value in VALUES.items():
+        if hasattr(components[0].params, param):
+            getattr(components[0].params, param).value = value
+    components[1].params.x.value, components[1].params.fr.value = -3, 0.5
+    return take_snapshot(components)
+
+
+def perturb(snapshot, index: int, name: str, step: float):
+    """Shifts a parameter of a snapshot's component by a step."""
+    components = list(snapshot.components)
+    params = vars(components[index].params).copy()
+    params[name] = params[name]._replace(value=params[name].value + step)
+    components[index] = components[index]._replace(params=FrozenNamespace(**params))
+    return snapshot._replace(components=tuple(components))
+
+
+@pytest.mark.parametrize(
+    "name", ["background", "point", "gauss", "lorentz", "uniform_disc", "Iring"]
+)
+def test_jacobian_matches_central_differences(name: str) -> None:
+    """Tests every parameter's derivative against central differences."""
+    snapshot = make_snapshot(name)
+    ucoord, vcoord = np.linspace(-120, 150, 200), np.linspace(80, -60, 200)
+    _, jacobian, labels = compute_complex_vis_and_jacobian(
+        snapshot, ucoord, 3.2e-6, vcoord
+    )
+
+    for row, (index, param) in zip(jacobian, labels):
+        value = getattr(snapshot.components[index].params, param).value
+        step = 1e-6 * max(1, abs(value))
+        upper, lower = (
+            compute_complex_vis_and_jacobian(
+                perturb(snapshot, index, param, sign * step), ucoord, 3.2e-6, vcoord
+            )[0]
+            for sign in [1, -1]
+        )
+        expected = (upper - lower) / (2 * step)
+        assert np.allclose(row, expected, rtol=1e-5, atol=1e-7), (index, param)
@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from fourim.backend.server import ModelServer
+
+SPEC = [{"name": "gauss", "params": {"fwhm": 3}}]
+
+
+async def evaluate_concurrently(*requests):
+    """Evaluates several requests concurrently on one server."""
+    server = ModelServer(batch_window=0.05)
+    return await asyncio.gather(
+        *(server.evaluate(SPEC, *request) for request in requests),
+        return_exceptions=True,
+    )
+
+
+@pytest.mark.parametrize(
+    "bad",
+    [
+        (np.ones(3), np.ones(4), 3.2e-6),
+        (np.ones((2, 3)), np.ones(6), 3.2e-6),
+        (np.ones(3), np.ones(3), np.full(2, 3.2e-6)),
+        (np.ones(3), np.ones(3), 3.2e-6, "phase"),
+    ],
+)
+def test_invalid_request_fails_alone(bad) -> None:
+    """Tests that an invalid request does not fail the others in its batch."""
+    good = (np.linspace(0, 100, 5), np.linspace(0, 50, 5), 3.2e-6)
+    good_result, bad_result = asyncio.run(evaluate_concurrently(good, bad))
+    assert isinstance(bad_result, ValueError)
+    assert good_result[0].shape == (5,)
+
+
+def test_results_keep_input_shape() -> None:
+    """Tests that the results have the shape of the uv-points."""
+    ucoord = np.linspace(0, 100, 6).reshape(2, 3)
+    (vis, phase), (flat_vis, _) = asyncio.run(
+        evaluate_concurrently(
+            (ucoord, ucoord, 3.2e-6), (ucoord.ravel(), ucoord.ravel(), 3.2e-6)
+        )
+    )
+    assert vis.shape == phase.shape == (2, 3)
+    assert np.allclose(vis.ravel(), flat_vis)
+
+
+async def request_over_socket(server: ModelServer, *lines: bytes):
+    """Sends request lines to a served model server and reads the responses
+    until the connection is closed."""
+    async with await server.start(port=0) as served:
+        port = served.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection(
+            "127.0.0.1", port, limit=2**26
+        )
+        writer.write(b"".join(lines))
+        await writer.drain()
+        writer.write_eof()
+        responses = [json.loads(line) async for line in reader]
+        writer.close()
+    return responses
+
+
+def test_large_request_over_socket() -> None:
+    """Tests a request (larger than asyncio's default line limit) over
+    the socket."""
+    ucoord = np.linspace(0, 150, 5000)
+    line = json.dumps(
+        {"id": 1, "model": SPEC, "u": ucoord.tolist(), "v": ucoord.tolist()}
+    )
+    assert len(line) > 2**16
+
+    (response,) = asyncio.run(request_over_socket(ModelServer(), line.encode() + b"\n"))
+    vis, _ = asyncio.run(ModelServer().evaluate(SPEC, ucoord, ucoord, 3.2e-6))
+    assert response["id"] == 1
+    assert np.allclose(response["vis"], vis)
+
+
+def test_line_over_limit_is_answered() -> None:
+    """Tests that a line over the limit is answered with an error and the
+    connection is closed."""
+    line = json.dumps({"id": 1, "model": SPEC, "u": [0.0] * 1000, "v": [0.0] * 1000})
+    responses = asyncio.run(
+        request_over_socket(ModelServer(max_line_size=1024), line.encode() + b"\n")
+    )
+    assert len(responses) == 1 and "error" in responses[0]
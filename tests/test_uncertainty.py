@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from fourim.backend.components import make_component
+from fourim.backend.compute import compute_complex_vis
+from fourim.backend.snapshot import take_snapshot
+from fourim.backend.uncertainty import compute_uncertainty_bands
+
+
+def make_snapshot(*specs):
+    """Makes a snapshot of components given as (name, values, sigmas)."""
+    components = {}
+    for index, (name, values, sigmas) in enumerate(specs):
+        components[index] = make_component(name)
+        for param, value in values.items():
+            getattr(components[index].params, param).value = value
+        for param, sigma in sigmas.items():
+            getattr(components[index].params, param).sigma = sigma
+    return take_snapshot(components)
+
+
+@pytest.mark.parametrize(
+    "specs",
+    [
+        [("gauss", {"x": 5}, {"fwhm": 0.2})],
+        [("gauss", {"x": 5}, {"fwhm": 0.2}), ("point", {"fr": 0}, {})],
+        [("gauss", {"x": 5}, {"fwhm": 0.2}), ("point", {"fr": 0.01}, {})],
+    ],
+)
+def test_phase_bands_follow_nominal(specs) -> None:
+    """Tests that the phase bands enclose the nominal phase (also if it
+    wraps around ±180°) and stay narrow for a size uncertainty."""
+    snapshot = make_snapshot(*specs)
+    _, phase = compute_complex_vis(snapshot)
+    _, (lower, upper) = compute_uncertainty_bands(snapshot, samples=200, seed=1)
+
+    width = 360 / 512
+    assert np.all(lower <= phase + width)
+    assert np.all(upper >= phase - width)
+    assert np.all(upper - lower < 5)
@@ -0,0 +1,70 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from fourim.backend.utils import compare_angles, to_polar, transform_coordinates
+
+RNG = np.random.default_rng(0)
+
+
+def reference_transform(x, y, cinc, pa, axis):
+    """The rotation and stretch computed step by step."""
+    if pa is not None:
+        pa = np.deg2rad(pa)
+        x, y = x * np.cos(pa) - y * np.sin(pa), x * np.sin(pa) + y * np.cos(pa)
+    if cinc is not None:
+        x = {"x": x / cinc, "y": x * cinc}.get(axis, x)
+    return x, y
+
+
+@pytest.mark.parametrize(
+    "cinc, pa, axis, use_out",
+    itertools.product(
+        [None, 0.6, np.full((3, 1), 0.6)],
+        [None, 35, np.full((3, 1), 35.0)],
+        ["x", "y", "z"],
+        [False, True],
+    ),
+)
+def test_transform_coordinates(cinc, pa, axis, use_out) -> None:
+    """Tests the transformation and that the coordinates are not changed."""
+    x, y = RNG.normal(size=50), RNG.normal(size=50)
+    x_copy, y_copy = x.copy(), y.copy()
+    expected = np.broadcast_arrays(*reference_transform(x, y, cinc, pa, axis))
+
+    out = None
+    if use_out:
+        out = np.empty(expected[0].shape), np.empty(expected[0].shape)
+    xt, yt = transform_coordinates(x, y, cinc, pa, axis, out=out)
+
+    assert np.array_equal(x, x_copy) and np.array_equal(y, y_copy)
+    assert np.allclose(xt, expected[0]) and np.allclose(yt, expected[1])
+    if use_out:
+        assert xt is out[0] and yt is out[1]
+
+
+@pytest.mark.parametrize("use_out", [False, True])
+def test_compare_angles(use_out: bool) -> None:
+    """Tests the wrapped differences and that the angles are not changed."""
+    angle1, angle2 = RNG.uniform(-10, 10, 100), RNG.uniform(-10, 10, 100)
+    angle1_copy, angle2_copy = angle1.copy(), angle2.copy()
+    out = np.empty(100) if use_out else None
+    diff = compare_angles(angle1, angle2, out=out)
+
+    assert np.array_equal(angle1, angle1_copy)
+    assert np.array_equal(angle2, angle2_copy)
+    assert np.all((diff >= -np.pi) & (diff < np.pi))
+    assert np.allclose(np.exp(1j * diff), np.exp(1j * (angle1 - angle2)))
+    if use_out:
+        assert diff is out
+
+
+def test_to_polar() -> None:
+    """Tests the radius and angle against np.hypot and np.arctan2."""
+    x, y = RNG.normal(size=(3, 50)), RNG.normal(size=50)
+    out = np.empty((3, 50)), np.empty((3, 50))
+    rho, phi = to_polar(x, y, out)
+    assert rho is out[0] and phi is out[1]
+    assert np.allclose(rho, np.hypot(x, y))
+    assert np.allclose(phi, np.arctan2(x, y))
@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from fourim.backend.components import make_component
+from fourim.backend.compute import compute_complex_vis, compute_uv_map
+from fourim.backend.snapshot import take_snapshot
+from fourim.config.options import compute_uv_grid
+
+
+def test_uv_map_matches_full_plane() -> None:
+    """Tests the mirrored half-plane against the full plane's evaluation."""
+    components = {0: make_component("gauss"), 1: make_component("uniform_disc")}
+    components[0].params.x.value, components[0].params.pa.value = 2, 30
+    components[0].params.cinc.value, components[1].params.diam.value = 0.6, 5
+    snapshot = take_snapshot(components)
+
+    model = SimpleNamespace(uv_dim=31, uv_max=150, uu=None, vv=None)
+    uu, vv = compute_uv_grid(model)
+    vis, phase = compute_uv_map(snapshot, uu, vv)
+
+    ucoord = np.linspace(-model.uv_max, model.uv_max, model.uv_dim)
+    full_uu, full_vv = np.meshgrid(ucoord, ucoord)
+    full_vis, full_phase = compute_complex_vis(snapshot, full_uu, None, full_vv)
+    assert np.allclose(vis, full_vis)
+    assert np.allclose(np.exp(1j * np.deg2rad(phase - full_phase)), 1)
+
+
+def test_even_dimension_is_refused() -> None:
+    """Tests that an even dimension (without v = 0) is refused."""
+    with pytest.raises(ValueError):
+        compute_uv_grid(SimpleNamespace(uv_dim=32, uv_max=150, uu=None, vv=None))
+
+    uu, vv = np.meshgrid(np.linspace(-150, 150, 32), np.linspace(150, 4.8, 16))
+    with pytest.raises(ValueError):
+        compute_uv_map(take_snapshot({0: make_component("gauss")}), uu, vv)